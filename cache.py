@@ -0,0 +1,183 @@
+"""
+A bounded cache of the cards computer players pick, so expensive players
+only decide once for each situation they see.
+
+A cached version of a player class is made by placing CachedPlayer before it:
+
+    class CachedMonteCarloPlayer(CachedPlayer, MonteCarloPlayer):
+        cache = DecisionCache()
+"""
+from collections import OrderedDict
+
+from uno_compact import encode, encode_cards
+
+CACHE_SIZE = 65536
+
+# returned by DecisionCache.get when a key is not cached, as None is a decision
+MISSING = object()
+
+
+class DecisionCache:
+    """
+    A least recently used cache holding at most a fixed amount of decisions.
+    """
+    def __init__(self, maxsize=CACHE_SIZE):
+        """
+        Construct an empty cache.
+
+        Parameters:
+            maxsize (int): The most decisions to hold before the least
+                           recently used decision is evicted.
+        """
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Look up a decision and mark it as recently used.
+
+        Parameters:
+            key (tuple): The situation the decision was made in.
+
+        Returns:
+            (Card): The cached decision, which may be None, or MISSING if the
+                    situation has not been cached.
+        """
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return MISSING
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Cache a decision, evicting the least recently used decision if full.
+
+        Parameters:
+            key (tuple): The situation the decision was made in.
+            value (Card): The decision made.
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_maxsize(self):
+        """(int) Returns the most decisions held by the cache."""
+        return self._maxsize
+
+    def hit_rate(self):
+        """(float) Returns the fraction of look ups which were cached."""
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def clear(self):
+        """
+        Remove every decision and reset the counters.
+        """
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        """
+        Return the amount of decisions held.
+        """
+        return len(self._entries)
+
+    def __str__(self):
+        """
+        Return a human readable summary of the cache counters.
+        """
+        return "{} / {} decisions, {} hits, {} misses, {} evictions ({:.1%} hit rate)".format(
+            len(self), self._maxsize, self.hits, self.misses, self.evictions, self.hit_rate())
+
+
+class CachedPlayer:
+    """
+    A mixin for computer players which caches the card picked by the player
+    class after it in the method resolution order.
+
+    Decisions are keyed by the cards in the hand, in any order, and the top
+    of the putdown pile, and if cache_sizes is True also the size of every
+    hand in the game. So the player being cached should pick the same card
+    regardless of the order the cards were added to its hand.
+
+    Subclasses set cache to a DecisionCache, shared by every instance.
+    """
+    cache = None
+    cache_sizes = False
+
+    def __init__(self, *args, **kwargs):
+        """
+        Construct the player, passing every argument to the cached player class.
+        """
+        super().__init__(*args, **kwargs)
+        self._game = None
+
+    def join(self, game):
+        """
+        Remember the game for the hand sizes of its players.
+
+        Parameters:
+            game (UnoGame): The game the player is seated in.
+        """
+        self._game = game
+        super().join(game)
+
+    def decision_key(self, top):
+        """
+        Return the key of the current situation in the cache.
+
+        Parameters:
+            top (Card): The card on top of the putdown pile.
+
+        Returns:
+            (tuple): The key, or None if the situation can not be cached.
+        """
+        cards = self.get_deck().get_cards()
+        # cached cards are removed from later hands, so must be shared instances
+        if not all(card.is_interned() for card in cards):
+            return None
+
+        try:
+            hand = bytes(sorted(encode_cards(cards)))
+            top = None if top is None else encode(top)
+        except ValueError:
+            return None
+
+        if not self.cache_sizes or self._game is None:
+            return hand, top
+        return hand, top, tuple(self._game.get_hand_size(player) for player in self._game.players)
+
+    def pick_card(self, putdown_pile):
+        """
+        Selects a card to play from the players current deck, using the cached
+        card if the same situation has been seen before.
+
+        Parameters:
+            putdown_pile (Deck): The pile of cards played on.
+
+        Returns:
+            (Card): The card to play, or None to pick up a card.
+        """
+        key = self.decision_key(putdown_pile.top())
+        if key is None:
+            return super().pick_card(putdown_pile)
+
+        card = self.cache.get(key)
+        if card is MISSING:
+            card = super().pick_card(putdown_pile)
+            self.cache.put(key, card)
+        elif card is not None:
+            self.get_deck().remove(card)
+        return card
@@ -1,103 +1,227 @@
+import argparse
+import math
+import os
+import time
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
 from tkinter import messagebox
 
-from uno import HumanPlayer, ComputerPlayer, Deck
-from uno import SkipCard, ReverseCard, Pickup2Card, Pickup4Card
+from render import CARD_BACK_BACKGROUND, CARD_BACK_FOREGROUND
+from render import CARD_BACK_TEXT_COLOUR, CARD_BACK_TEXT
+from render import BoardModel, Face
+from render import PUTDOWN, PICKUP, SPECIAL, SIZE, PLAYING, ACTIVE, NAME, DELETE
+from instrument import FrameProfiler
+from scheduler import FRAME_TIME, FrameScheduler
+from strategies import BASELINE, STRATEGIES, parse_strategies
+from uno import HumanPlayer, Deck, matches
 from uno_util import FULL_DECK, build_deck, UnoGame, generate_name
 
 CARD_HEIGHT = 100
 CARD_WIDTH = 75
 CARD_SPACE = 10
 
-CARD_OVAL_COLOUR = "#fceee3"
-CARD_BACK_BACKGROUND = "black"
-CARD_BACK_FOREGROUND = "red"
-CARD_BACK_TEXT_COLOUR = "yellow"
-CARD_BACK_TEXT = "UNO"
-
 AI_DELAY = 2000
 
+# the delay before each computer turn at each speed, in milliseconds
+SPEEDS = {
+    "Slow": AI_DELAY,
+    "Normal": 1000,
+    "Fast": 250,
+}
+
+# the widest a player's deck is drawn before it scrolls, and the amount of
+# cards either side of the visible cards which are drawn ahead of scrolling
+DECK_WIDTH = CARD_WIDTH * 10
+SCROLL_MARGIN = 2
+
+# the canvas calls counted when profiling
+CANVAS_CALLS = ("config", "itemconfig", "create_image", "create_text")
+
+IMAGE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
+
+
+class SpriteCache:
+    """
+    Card faces rendered once into images shared by every card view.
+
+    A face is the card background and either its oval or its icon, so a card
+    view only needs the face image and a text item. Icons are loaded from
+    disk the first time they are used. Images can only be created once a
+    Tk root exists, so nothing is rendered until a face is first requested.
+    """
+
+    def __init__(self, directory=IMAGE_DIRECTORY):
+        """
+        Construct an empty sprite cache.
+
+        Parameters:
+            directory (str): The directory containing the icon images.
+        """
+        self._directory = directory
+        self._icons = {}
+        self._faces = {}
+
+    def icon(self, name):
+        """Return the icon image with the given name, loading it once.
+
+        Parameters:
+            name (str): The name of the png file in the image directory.
+
+        Returns:
+            (tk.PhotoImage): The icon.
+        """
+        image = self._icons.get(name)
+        if image is None:
+            path = os.path.join(self._directory, name + ".png")
+            image = self._icons[name] = tk.PhotoImage(file=path)
+        return image
+
+    def face(self, background, oval=None, icon=None):
+        """Return the image of a card face, rendering it once.
+
+        Parameters:
+            background (tk.Color): The background colour of the card.
+            oval (tk.Color): The colour of the oval in the middle of the card,
+                             or None for no oval.
+            icon (str): The name of an icon to draw in the middle of the card,
+                        or None for no icon.
+
+        Returns:
+            (tk.PhotoImage): The face of the card.
+        """
+        key = (background, oval, icon)
+        image = self._faces.get(key)
+        if image is None:
+            image = self._faces[key] = self.render(background, oval, icon)
+        return image
+
+    def render(self, background, oval=None, icon=None):
+        """Render a card face into a new image.
+
+        Parameters:
+            background (tk.Color): The background colour of the card.
+            oval (tk.Color): The colour of the oval, or None for no oval.
+            icon (str): The name of an icon, or None for no icon.
+
+        Returns:
+            (tk.PhotoImage): The face of the card.
+        """
+        image = tk.PhotoImage(width=CARD_WIDTH, height=CARD_HEIGHT)
+
+        # background with a one pixel outline, as the canvas would draw it
+        image.put("black", to=(0, 0, CARD_WIDTH, CARD_HEIGHT))
+        image.put(background, to=(1, 1, CARD_WIDTH - 1, CARD_HEIGHT - 1))
+
+        if oval is not None:
+            self._put_oval(image, "black", 10, 10, CARD_WIDTH - 10, CARD_HEIGHT - 10)
+            self._put_oval(image, oval, 11, 11, CARD_WIDTH - 11, CARD_HEIGHT - 11)
+
+        if icon is not None:
+            icon = self.icon(icon)
+            left = (CARD_WIDTH - icon.width()) // 2
+            top = (CARD_HEIGHT - icon.height()) // 2
+            image.tk.call(image, "copy", icon, "-to", left, top)
+
+        return image
+
+    def _put_oval(self, image, colour, left, top, right, bottom):
+        """Fill an oval in an image one row at a time."""
+        centre_x = (left + right) / 2
+        centre_y = (top + bottom) / 2
+        radius_x = (right - left) / 2
+        radius_y = (bottom - top) / 2
+
+        for y in range(top, bottom):
+            distance = (y + 0.5 - centre_y) / radius_y
+            half = radius_x * math.sqrt(max(1 - distance * distance, 0))
+            start, end = round(centre_x - half), round(centre_x + half)
+            if end > start:
+                image.put(colour, to=(start, y, end, y + 1))
+
+
+SPRITES = SpriteCache()
+
 
 class CardView:
     """
     A class to manage the drawing of a Uno card on a canvas.
+
+    A card is drawn as an image of its face from the shared sprite cache with
+    its text on top.
     """
 
-    def __init__(self, canvas, left_side, oval_colour=CARD_OVAL_COLOUR,
-                 background_colour=CARD_BACK_BACKGROUND,
+    def __init__(self, canvas, left_side, background_colour=CARD_BACK_BACKGROUND,
                  foreground_colour=CARD_BACK_FOREGROUND,
-                 text_colour=CARD_BACK_TEXT_COLOUR, text=CARD_BACK_TEXT):
+                 text_colour=CARD_BACK_TEXT_COLOUR, text=CARD_BACK_TEXT,
+                 sprites=SPRITES):
         """
         Construct a new card to be drawn on the given canvas at the left_position.
 
         Parameters:
             canvas (tk.Canvas): The canvas to draw the card onto.
             left_side (int): The amount of pixels in the canvas to draw the card.
-            oval_colour (tk.Color): Colour of the oval for this card.
             background_colour (tk.Color): Backface card background colour.
             foreground_colour (tk.Color): Backface card foreground colour.
             text_colour (tk.Color): Backface card text colour.
             text (str): Backface card text to display.
+            sprites (SpriteCache): The cache of card face images.
         """
         self._canvas = canvas
 
         self.left_side = left_side
         self.right_side = left_side + CARD_WIDTH
 
-        self._oval_colour = oval_colour
-        self._background = background_colour
-        self._foreground = foreground_colour
-        self._text_colour = text_colour
-        self._text = text
-        self._image = None
+        self._back = Face(background_colour, foreground_colour, None, text, text_colour)
+        self._sprites = sprites
 
         self.draw()
 
     def draw(self):
         """Draw the backface of the card to the canvas."""
-        self._back = self.draw_back(self._background)
-        self._oval = self.draw_circle(self._foreground)
-        self._text_view = self.draw_text(self._text, self._text_colour)
+        self._face = self.draw_image(self.face_image(self._back))
+        self._text_view = self.draw_text(self._back.text, self._back.text_colour)
 
-    def redraw(self, card):
-        """Redraw the card view with the properties of the given card.
+    def paint(self, face):
+        """Redraw the card view with the given appearance.
 
         Parameters:
-            card (Card): The card to draw to the canvas. If None, draw the
-                         backface of the card.
+            face (Face): The side of the card to draw.
         """
-        if card is not None:
-            # draw the card with details from the card parameter
-            self._canvas.itemconfig(self._back, fill=card.get_colour().value)
-            self._canvas.itemconfig(self._oval, fill=self._oval_colour)
-            self._canvas.itemconfig(self._text_view, fill=card.get_colour().value,
-                                    text=card.get_number())
-        else:
-            # draw the backface of the card
-            self._canvas.itemconfig(self._back, fill=self._background)
-            self._canvas.itemconfig(self._oval, fill=self._foreground)
-            self._canvas.itemconfig(self._text_view, fill=self._text_colour,
-                                    text=self._text)
+        self._canvas.itemconfig(self._face, image=self.face_image(face))
+        self._canvas.itemconfig(self._text_view, fill=face.text_colour, text=face.text)
 
-    def draw_back(self, colour):
-        """Draw the back of the canvas (the background not the backface).
+    def move_to(self, left_side):
+        """Move the card to a new position and show it above the other cards.
 
         Parameters:
-            colour (tk.Color): The colour of the background.
+            left_side (int): The amount of pixels in the canvas to draw the card.
         """
-        return self._canvas.create_rectangle(self.left_side, 0,
-                                             self.right_side, CARD_HEIGHT,
-                                             fill=colour)
+        distance = left_side - self.left_side
+        for item in (self._face, self._text_view):
+            if distance:
+                self._canvas.move(item, distance, 0)
+            self._canvas.itemconfig(item, state="normal")
+            self._canvas.tag_raise(item)
+
+        self.left_side = left_side
+        self.right_side = left_side + CARD_WIDTH
+
+    def hide(self):
+        """Hide the card until it is moved."""
+        for item in (self._face, self._text_view):
+            self._canvas.itemconfig(item, state="hidden")
 
-    def draw_circle(self, colour):
-        """Draw a circle in the middle of the card.
+    def face_image(self, face):
+        """Return the image of the background of a side of a card.
 
         Parameters:
-            colour (tk.Color): The colour of the cirlce.
+            face (Face): The side of the card to draw.
+
+        Returns:
+            (tk.PhotoImage): The image of the card's face.
         """
-        return self._canvas.create_oval(self.left_side + 10, 10,
-                                        self.right_side - 10, CARD_HEIGHT - 10,
-                                        fill=colour)
+        return self._sprites.face(face.background, face.oval, face.icon)
 
     def draw_text(self, text, colour):
         """Draw text in the middle of the card.
@@ -114,89 +238,26 @@ class CardView:
         """Draw an image in the middle of the card.
 
         Parameters:
-            image (str): The filepath of the image to display.
+            image (tk.PhotoImage): The image to display.
         """
-        self._image = tk.PhotoImage(file=image)
         return self._canvas.create_image(self.left_side + (CARD_WIDTH // 2),
-                                         CARD_HEIGHT // 2, image=self._image)
-
-
-CARD_ICONS = {
-    SkipCard: "skip",
-    ReverseCard: "reverse"
-}
-
-
-class IconCardView(CardView):
-    """
-    A card that has an image associated with it.
-    """
-
-    def draw(self):
-        """Draw the backface of the card to the canvas."""
-        super().draw()
-        self._image_view = None
-
-    def redraw(self, card):
-        """Redraw the card view with an icon.
-
-        Parameters:
-            card (Card): The card to draw to the canvas. If None, draw the
-                         backface of the card.
-        """
-        super().redraw(card)
-
-        if card is not None:
-            # clear text on the card
-            self._canvas.itemconfig(self._text_view, text="")
-
-            if self._image_view is None:
-                # draw an image based on the card's class
-                image = CARD_ICONS.get(card.__class__, "skip")
-                self._image_view = self.draw_text(image, 'black')
-            else:
-                # show the image
-                self._canvas.itemconfig(self._image_view, state="normal")
-        else:
-            if self._image_view is not None:
-                # hide the image
-                self._canvas.itemconfig(self._image_view, state="hidden")
-
-
-class PickupCardView(CardView):
-    """
-    A card that displays the amount of cards to pickup.
-    """
-
-    def redraw(self, card):
-        """Redraw the card view with the properties of the given card.
-
-        Parameters:
-            card (Card): The card to draw to the canvas. If None, draw the
-                         backface of the card.
-        """
-        super().redraw(card)
-
-        if card is not None:
-            self._canvas.itemconfig(self._text_view,
-                                    text=f"+{card.get_pickup_amount()}")
-
-
-CARD_VIEWS = {
-    SkipCard: IconCardView,
-    ReverseCard: IconCardView,
-    Pickup2Card: PickupCardView,
-    Pickup4Card: PickupCardView
-}
+                                         CARD_HEIGHT // 2, image=image)
 
 
 class DeckView(tk.Canvas):
     """
     A Canvas that displays a deck of uno cards on a board.
+
+    The deck is drawn from the face of the card in each slot. A deck wider
+    than its maximum width scrolls, and card views are only drawn for the
+    visible slots, being reused for other slots as the deck scrolls. Cards in
+    piles drawn on top of each other are hidden by the top card, so only the
+    top card is drawn.
     """
 
     def __init__(self, master, pick_card=None, border_colour="#6D4C41",
-                 active_border="red", offset=CARD_WIDTH, *args, **kwargs):
+                 active_border="red", offset=CARD_WIDTH, max_width=None,
+                 *args, **kwargs):
         """
         Construct a deck view.
 
@@ -206,21 +267,44 @@ class DeckView(tk.Canvas):
                                   Takes an int representing the cards index.
             border_colour (tk.Color): The colour of the decks border.
             offset (int): The offset between cards in the deck.
+            max_width (int): The widest the deck is drawn before it scrolls,
+                             or None to always fit every card.
         """
         super().__init__(master, *args, **kwargs, bg=border_colour,
-                         highlightthickness=5, highlightbackground=border_colour)
+                         highlightthickness=5, highlightbackground=border_colour,
+                         xscrollincrement=max(offset, 1))
 
         self._active = False
         self._playing = False
 
         self.offset = offset
+        self.max_width = max_width
         self.pick_card = pick_card
         self.cards = {}
 
+        # the face of the card in each slot of the deck, the face last drawn
+        # in each slot with a card view, the amount of cards the canvas was
+        # last sized for and the last border colour
+        self._faces = {}
+        self._drawn = {}
+        self._size = 0
+        self._highlight = border_colour
+
+        # card views no longer in a slot, to be reused
+        self._pool = []
+
+        self._scrollbar = None
+        self._scrolling = False
+
         self._border_colour = border_colour
         self._active_border = active_border
 
         self.bind("<Button-1>", self._handle_click)
+        self.bind("<MouseWheel>", self._handle_scroll)
+        self.bind("<Button-4>", self._handle_scroll)
+        self.bind("<Button-5>", self._handle_scroll)
+
+        self.resize(0)
 
     def toggle_active(self, active=None):
         """Toggle whether the deck should be clickable.
@@ -244,80 +328,172 @@ class DeckView(tk.Canvas):
         else:
             self._playing = playing
 
+    def set_scrollbar(self, scrollbar):
+        """Scroll the deck with a horizontal scrollbar, shown while the deck
+        is too wide for the view.
+
+        Parameters:
+            scrollbar (tk.Scrollbar): The scrollbar, packed in the same parent.
+        """
+        self._scrollbar = scrollbar
+        scrollbar.config(command=self.scroll)
+        self.config(xscrollcommand=scrollbar.set)
+
     def _handle_click(self, event):
         """Handles when the player clicks the deck."""
-        # the index of the card in the deck
-        slot = event.x // CARD_WIDTH
+        # the index of the card in the deck, through the scrolled view
+        slot = int(self.canvasx(event.x)) // CARD_WIDTH
 
         if self.pick_card is not None and self._active:
             self.pick_card(slot)
 
-    def get_card_view(self, card):
-        """Determines the view class for a card.
+    def _handle_scroll(self, event):
+        """Handles when the player scrolls the deck with their mouse wheel."""
+        if not self._scrolling:
+            return
+
+        if event.num == 4 or event.delta > 0:
+            self.scroll("scroll", -1, "units")
+        else:
+            self.scroll("scroll", 1, "units")
+
+    def scroll(self, *args):
+        """Scroll the deck and draw the cards scrolled into view.
 
         Parameters:
-            card (Card): The card that requires a view.
+            args (tuple): The arguments of tk.Canvas.xview, as passed by a scrollbar.
+        """
+        self.xview(*args)
+        self.refresh()
 
-        Returns:
-            (CardView): The view for the given card.
+    def set_size(self, size):
         """
-        return CARD_VIEWS.get(card.__class__, CardView)
+        Set the amount of cards in the deck, resizing the canvas to fit them.
 
-    def draw_card(self, card, slot):
+        Parameters:
+            size (int): The amount of cards in the deck.
+        """
+        if size != self._size:
+            self.resize(size)
+            self._size = size
+
+    def set_face(self, slot, face):
+        """
+        Set the face of the card in a slot, drawn on the next refresh.
+
+        Parameters:
+            slot (int): The position in the deck of the card.
+            face (Face): The side of the card to draw.
+        """
+        self._faces[slot] = face
+
+    def remove_face(self, slot):
+        """
+        Remove the card in a slot, removed on the next refresh.
+
+        Parameters:
+            slot (int): The position in the deck of the card.
+        """
+        self._faces.pop(slot, None)
+
+    def draw_card(self, face, slot):
         """
-        Draw a card in the given slot on the deck.
+        Draw a card in the given slot on the deck, reusing a card view no
+        longer in a slot if there is one.
 
         Parameters:
-            card (Card): The card to draw to the deck.
+            face (Face): The side of the card to draw.
             slot (int): The position in the deck to draw the card.
 
         Returns:
-            (CardView): The card view drawn at the slot for a given card.
+            (CardView): The card view drawn at the slot.
         """
         left_side = slot * self.offset
 
-        view = self.get_card_view(card)
-        self.cards[slot] = view(self, left_side)
+        if self._pool:
+            view = self._pool.pop()
+            view.move_to(left_side)
+        else:
+            view = CardView(self, left_side)
 
-        return self.cards[slot]
+        view.paint(face)
+        self.cards[slot] = view
+        self._drawn[slot] = face
+        return view
 
-    def draw(self, deck, show=True):
+    def clear_slot(self, slot):
         """
-        Draw the deck based of the data in a given deck instance.
+        Remove the card drawn in the given slot, if any, keeping its view
+        hidden to be reused.
 
-        Parameter:
-            deck (Deck): The deck to draw in this canvas.
-            show (bool): Whether the cards should be displayed or not.
+        Parameters:
+            slot (int): The position in the deck to clear.
         """
-        # resize the canvas to fit all the cards in the deck
-        self.resize(deck.get_amount())
+        view = self.cards.pop(slot, None)
+        if view is not None:
+            view.hide()
+            self._pool.append(view)
+        self._drawn.pop(slot, None)
 
-        # highlight border
-        if self._playing:
-            self.config(highlightbackground=self._active_border)
-        else:
-            self.config(highlightbackground=self._border_colour)
+    def visible_slots(self, size):
+        """
+        Calculate the slots of the deck which can be seen.
 
-        for i, card in enumerate(deck.get_cards()):
+        Parameters:
+            size (int): The amount of cards in the deck.
 
-            # retrieve the CardView class for this card
-            view = self.cards.get(i, None)
+        Returns:
+            (range): The visible slots, with a margin either side when scrolling.
+        """
+        if size == 0:
+            return range(0)
 
-            # draw the CardView if it doesn't exist already
-            if view is None:
-                view = self.draw_card(card, i)
+        # cards drawn on top of each other are hidden by the top card
+        if self.offset == 0:
+            return range(size - 1, size)
 
-            # if the type of card has changed, redraw the CardView
-            if type(view) != self.get_card_view(card):
-                view = self.draw_card(card, i)
+        if not self._scrolling:
+            return range(size)
 
-            # update details in the CardView
-            view.redraw(card if show else None)
+        left = self.canvasx(0)
+        first = max(int(left // self.offset) - SCROLL_MARGIN, 0)
+        last = min(int((left + self.max_width) // self.offset) + SCROLL_MARGIN, size - 1)
+        return range(first, last + 1)
+
+    def refresh(self):
+        """
+        Draw the changes to the faces and flags of the deck, only touching the
+        visible slots whose faces changed.
+        """
+        # highlight border
+        highlight = self._active_border if self._playing else self._border_colour
+        if highlight != self._highlight:
+            self.config(highlightbackground=highlight)
+            self._highlight = highlight
+
+        slots = self.visible_slots(self._size)
+
+        # free the views of slots which can not be seen for visible slots
+        for slot in [slot for slot in self.cards
+                     if slot not in slots or slot not in self._faces]:
+            self.clear_slot(slot)
+
+        for slot in slots:
+            face = self._faces.get(slot)
+            if face is None or self._drawn.get(slot) == face:
+                continue
+
+            view = self.cards.get(slot)
+            if view is None:
+                self.draw_card(face, slot)
+            else:
+                view.paint(face)
+                self._drawn[slot] = face
 
     def resize(self, size):
         """
         Calculate the dimensions required to fit 'size' cards in this canvas
-        and update the canvas size.
+        and update the canvas size, scrolling if they do not fit.
 
         Parameters:
             size (int): The amount of cards that should be displayed in this deck.
@@ -330,96 +506,205 @@ class DeckView(tk.Canvas):
 
         height = CARD_HEIGHT
 
-        # resize canvas, adjust for border
-        self.config(width=width - 10, height=height - 10)
+        self._scrolling = self.max_width is not None and width > self.max_width
+        view_width = self.max_width if self._scrolling else width
+
+        # resize canvas, adjust for border, the border covering the same
+        # edges of the cards whether or not the deck scrolls
+        self.config(width=view_width - 10, height=height - 10,
+                    scrollregion=(5, 5, width - 5, height - 5))
+
+        if self._scrollbar is not None:
+            if self._scrolling:
+                self._scrollbar.pack(after=self, fill=tk.X)
+            else:
+                self._scrollbar.pack_forget()
+
+
+class TkBackend:
+    """
+    Applies the draw operations of the board model to the deck views and
+    title labels of an UnoApp.
+    """
+
+    def __init__(self, decks, titles):
+        """
+        Construct a backend drawing to the given views.
+
+        Parameters:
+            decks (dict<object, DeckView>): The view of each part of the board,
+                                            by seat or pile name.
+            titles (dict<int, tk.Label>): The title label of each seat.
+        """
+        self._decks = decks
+        self._titles = titles
+
+    def apply(self, ops):
+        """
+        Apply the draw operations of a frame, refreshing every changed deck once.
+
+        Parameters:
+            ops (list<DrawOp>): The operations to apply.
+        """
+        changed = {}
+        for op in ops:
+            deck = self._decks[op.part]
+            changed[op.part] = deck
+
+            if op.key == NAME:
+                if op.action != DELETE:
+                    self._titles[op.part].config(text=op.value)
+            elif op.key == SIZE:
+                deck.set_size(0 if op.action == DELETE else op.value)
+            elif op.key == PLAYING:
+                deck.toggle_playing(playing=op.action != DELETE and op.value)
+            elif op.key == ACTIVE:
+                deck.toggle_active(active=op.action != DELETE and op.value)
+            elif op.action == DELETE:
+                deck.remove_face(op.key)
+            else:
+                deck.set_face(op.key, op.value)
+
+        for deck in changed.values():
+            deck.refresh()
 
 
 class UnoApp:
     """A graphical Uno application"""
 
-    def __init__(self, master, game, board_colour="#F9B05A"):
+    def __init__(self, master, game, board_colour="#F9B05A", delay=AI_DELAY,
+                 fast_forward=False, profiler=None):
         """Create a new Uno application based on a given UnoGame.
 
         Parameters:
             master (tk.Tk): The root window for the Uno application.
             game (UnoGame): The game to display in this application.
             board_colour (tk.Color): The background colour of the board.
+            delay (int): The milliseconds to wait before each computer turn.
+            fast_forward (bool): Whether to take consecutive computer turns
+                                 without waiting, only drawing the board
+                                 once they are done.
+            profiler (FrameProfiler): A profiler installed with instrument,
+                                      shown in an overlay, or None.
         """
         self._master = master
         self.game = game
         self.board_colour = board_colour
 
+        self._delay = tk.IntVar(master, value=delay)
+        self._fast_forward = tk.BooleanVar(master, value=fast_forward)
+
+        # computer turns are computed on a copy of the game on a worker
+        # thread so the window stays responsive, the turn being computed is
+        # the player and the future of the card they picked. The copy and its
+        # players are kept for the whole game, so players which search keep
+        # their settings and what they have learnt between turns
+        self._workers = ThreadPoolExecutor(max_workers=1)
+        self._turn = None
+        self._shadow = None
+
+        # every redraw and delayed callback runs on the ticks of the
+        # scheduler, the pending callback is the next step of a computer turn
+        self._scheduler = FrameScheduler(master, self.update)
+        self._pending = None
+
         # define all the class variables
-        self._board = self.decks = self._putdown_pile = self._pickup_pile \
+        self._board = self._putdown_pile = self._pickup_pile \
             = self._special_pile = None
 
+        # the deck view and title label of each seat, reused between games
+        self._seats = []
+
+        # the model of what the board looks like and the backend drawing it
+        self._model = self._backend = None
+
+        # an overlay below the board showing the latest frame profiled
+        self._profiler = profiler
+        if profiler is not None:
+            overlay = tk.Label(master, anchor=tk.W, font=('Courier', '10'))
+            overlay.pack(side=tk.BOTTOM, fill=tk.X)
+            profiler.set_listener(lambda profiler: overlay.config(text=str(profiler)))
+
         self.render_decks()
 
         self.add_menu()
 
     def render_decks(self):
-        # remove old frame, if it exists
-        if self._board is not None:
-            self._board.pack_forget()
+        """Bind the board to the players of the game, building it if needed."""
+        players = self.game.players
+
+        # the board is only rebuilt if the amount of seats has changed
+        if self._board is not None and len(self._seats) != len(players):
+            self._board.destroy()
+            self._board = None
+
+        if self._board is None:
+            self.build_board(len(players))
 
+    def build_board(self, seats):
+        """Create the board with a deck view and title for every seat.
+
+        Parameters:
+            seats (int): The amount of players in the game.
+        """
         # create a board frame
         self._board = board = tk.Frame(self._master, padx=20, pady=20,
                                        bg=self.board_colour,
                                        borderwidth=2, relief="groove")
         board.pack(expand=True, fill=tk.BOTH)
 
-        self.decks = decks = {}
+        self._seats = []
 
         # split the board evenly
-        split = len(self.game.players) // 2
+        split = seats // 2
 
         # draw the first decks of players
-        for i, player in enumerate(self.game.players[:split]):
-            decks[player] = self.draw_deck(player, show=False)
-            self.draw_title(player)
+        for seat in range(split):
+            self._seats.append((self.draw_deck(seat), self.draw_title(seat)))
 
         # draw the middle row of piles
         self._putdown_pile, self._pickup_pile, self._special_pile = self.draw_board()
 
         # draw the second decks of players
-        for i, player in enumerate(self.game.players[split:]):
-            decks[player] = self.draw_deck(player, show=False)
-            self.draw_title(player)
+        for seat in range(split, seats):
+            self._seats.append((self.draw_deck(seat), self.draw_title(seat)))
+
+        decks = {seat: deck for seat, (deck, _) in enumerate(self._seats)}
+        decks.update({PUTDOWN: self._putdown_pile, PICKUP: self._pickup_pile,
+                      SPECIAL: self._special_pile})
+        titles = {seat: title for seat, (_, title) in enumerate(self._seats)}
+
+        if self._profiler is not None:
+            for part, deck in decks.items():
+                name = "seat {}".format(part) if isinstance(part, int) else part
+                self._profiler.name(deck, name)
+
+        # a new board has nothing drawn on it
+        self._model = BoardModel()
+        self._backend = TkBackend(decks, titles)
 
     def update(self):
-        """Redraw all the decks in the game."""
-        # draw all player decks
-        for player in self.game.players:
-            playing = player == self.game.current_player()
-            clickable = player.is_playable() and playing
-            self.decks[player].toggle_active(active=clickable)
-            self.decks[player].toggle_playing(playing=playing)
-            self.decks[player].draw(player.get_deck(), show=clickable)
-
-        # draw the pile decks
-        self._putdown_pile.draw(self.game.putdown_pile)
-        self._pickup_pile.draw(self.game.pickup_pile, show=False)
-        self._special_pile.draw(self.game.special_pile)
+        """Redraw the parts of the board which have changed."""
+        self._backend.apply(self._model.render(self.game))
 
     def new_game(self):
         """Start a new game"""
         # clone the old players
-        players = []
-        for player in self.game.players:
-            players.append(player.__class__(player.get_name()))
+        players = [player.clone() for player in self.game.players]
 
         # generate a new deck
         pickup_pile = Deck(build_deck(FULL_DECK))
         pickup_pile.shuffle()
 
         # make players pickup cards
-        for player in players:
-            cards = pickup_pile.pick(7)
-            player.get_deck().add_cards(cards)
+        pickup_pile.deal(players)
 
-        self.game = UnoGame(pickup_pile, players)
+        # stop the computer turns of the old game
+        self.cancel_turn()
+
+        self.game = UnoGame(pickup_pile, players, recycle=True)
         self.render_decks()
-        self.update()
+        self.play()
 
     def add_menu(self):
         """Create a menu for the application"""
@@ -430,8 +715,16 @@ class UnoApp:
         file.add_command(label="New Game", command=self.new_game)
         file.add_command(label="Exit", command=self._master.destroy)
 
+        # speed menu with the delay before computer turns
+        speed = tk.Menu(menu)
+        for label, delay in SPEEDS.items():
+            speed.add_radiobutton(label=label, variable=self._delay, value=delay)
+        speed.add_separator()
+        speed.add_checkbutton(label="Fast Forward", variable=self._fast_forward)
+
         # add file menu to menu
         menu.add_cascade(label="File", menu=file)
+        menu.add_cascade(label="Speed", menu=speed)
         self._master.config(menu=menu)
 
     def pick_card(self, player, slot):
@@ -441,12 +734,16 @@ class UnoApp:
             player (Player): The selecting player.
             slot (int): The card index they selected to play.
         """
+        # the deck is drawn as clickable until the next tick after a move
+        if player is not self.game.current_player():
+            return
+
         # get the selected card
         card = player.get_deck().get_cards()[slot]
 
         # pick the card if it matches
-        if card.matches(self.game.putdown_pile.top()):
-            card = player.get_deck().get_cards().pop(slot)
+        if matches(card, self.game.putdown_pile.top()):
+            card = player.get_deck().pop(slot)
             self.game.select_card(player, card)
 
             # wait for next move
@@ -458,7 +755,7 @@ class UnoApp:
             return
 
         # select card from deck
-        next_card = self.game.pickup_pile.pick()
+        next_card = self.game.draw_cards()
         # add card to players deck
         self.game.current_player().get_deck().add_cards(next_card)
 
@@ -478,102 +775,225 @@ class UnoApp:
         # left pickup card pile view
         pickup_pile = DeckView(board, offset=0, pick_card=self.draw_card)
         pickup_pile.toggle_active(active=True)
-        pickup_pile.draw(self.game.putdown_pile, show=False)
         pickup_pile.pack(side=tk.LEFT, padx=50)
 
         # right putdown card pile view
         putdown_pile = DeckView(board, offset=2)
-        putdown_pile.draw(self.game.putdown_pile)
         putdown_pile.pack(side=tk.RIGHT, padx=50)
 
         # middle right view for special cards
         special_pile = DeckView(board, offset=0)
-        special_pile.draw(self.game.special_pile, show=False)
         special_pile.pack(side=tk.RIGHT)
 
         return putdown_pile, pickup_pile, special_pile
 
-    def draw_deck(self, player, show=True):
-        """Draw a players deck to the board
+    def draw_deck(self, seat):
+        """Draw the deck of the player in a seat to the board
 
         Parameters:
-            player (Player): The player whose deck should be drawn.
-            show (bool): Whether or not to display the players deck.
+            seat (int): The index of the player in the game.
 
         Returns:
-            DeckView: The deck view for the player.
+            DeckView: The deck view for the seat.
         """
-        deck = DeckView(self._board,
-                        pick_card=lambda card: self.pick_card(player, card))
+        deck = DeckView(self._board, max_width=DECK_WIDTH,
+                        pick_card=lambda card: self.pick_card(self.game.players[seat], card))
         deck.pack(side=tk.TOP)
-        deck.draw(player.get_deck(), show=show)
+        deck.set_scrollbar(tk.Scrollbar(self._board, orient=tk.HORIZONTAL))
         return deck
 
-    def draw_title(self, player):
-        """Draw a deck label for a player to the board.
+    def draw_title(self, seat):
+        """Draw a deck label for the player in a seat to the board.
 
         Parameters:
-            player (Player): The player to draw.
+            seat (int): The index of the player in the game.
+
+        Returns:
+            tk.Label: The label for the seat.
         """
-        label = tk.Label(self._board, text=player.get_name(),
+        label = tk.Label(self._board, text=self.game.players[seat].get_name(),
                          font=('Times', '24', 'bold italic'),
                          bg=self.board_colour)
         label.pack(side=tk.TOP)
+        return label
 
     def step(self):
         """Perform actions to advance the game a turn."""
-        # end the game if a player has won
-        if self.game.is_over():
-            messagebox.showinfo("Game Over",
-                                f"{self.game.winner.get_name()} has won!")
-            self._master.destroy()
-            return
+        # while fast forwarding, computer turns are taken for up to a frame
+        deadline = time.perf_counter() + FRAME_TIME / 1000
 
-        # move to the next player
-        player = self.game.next_player()
-        self.update()
+        while True:
+            self._scheduler.invalidate()
 
-        # exit and wait for the player to make their move
-        if player.is_playable():
-            return
+            # end the game once any other callbacks have run
+            if self.game.is_over():
+                self._pending = self._scheduler.call_later(0, self.end_game)
+                return
+
+            # move to the next player
+            player = self.game.next_player()
 
-        self._master.after(AI_DELAY, self.take_turn)
+            # exit and wait for the player to make their move
+            if player.is_playable():
+                return
+
+            # compute the move in the background
+            self._turn = player, self.compute_turn(player)
+
+            if not self._fast_forward.get():
+                self._pending = self._scheduler.call_later(self._delay.get(), self.take_turn)
+                return
+
+            # wait for the move for what is left of the frame
+            try:
+                self._turn[1].result(timeout=max(deadline - time.perf_counter(), 0))
+            except FutureTimeout:
+                self._pending = self._scheduler.call_later(0, self.take_turn)
+                return
+
+            self.apply_turn()
+
+            # draw the board before taking more turns
+            if time.perf_counter() >= deadline:
+                self._pending = self._scheduler.call_later(0, self.step)
+                return
 
     def take_turn(self):
-        """Make an automated turn"""
-        # make an automated move
-        player = self.game.current_player()
-        self.game.take_turn(player)
-        self.update()
+        """Make an automated turn once it has been computed, checking every tick until it has"""
+        self._pending = None
+        if not self._turn[1].done():
+            self._pending = self._scheduler.call_later(0, self.take_turn)
+            return
 
+        self.apply_turn()
         self.step()
 
+    def compute_turn(self, player):
+        """Start picking the card of a computer player in the background.
+
+        The card is picked by the player's seat in a copy of the game, which
+        is brought up to date with the game before each turn, so the game
+        being drawn is only changed on the main thread when the card is
+        played.
+
+        Parameters:
+            player (Player): The computer player whose turn it is.
+
+        Returns:
+            Future: The card picked, or None to pick up a card.
+        """
+        if self._shadow is None:
+            self._shadow = self.game.clone(rng=self.game.get_random().getrandbits(64))
+
+        shadow = self._shadow
+        snapshot = self.game.snapshot()
+        seat = shadow.players[self.game.players.index(player)]
+
+        def pick_card():
+            shadow.restore(snapshot)
+            return seat.pick_card(shadow.putdown_pile)
+
+        return self._workers.submit(pick_card)
+
+    def apply_turn(self):
+        """Play the card picked by the computer player whose turn was computed."""
+        player, decision = self._turn
+        self._turn = None
+
+        card = decision.result()
+        if card is not None:
+            player.get_deck().remove(card)
+        self.game.play_card(player, card)
+
+    def cancel_turn(self):
+        """Cancel the computer turn being computed or scheduled, if any."""
+        if self._pending is not None:
+            self._scheduler.cancel(self._pending)
+            self._pending = None
+
+        # a move already being computed can not be interrupted, so it is left
+        # to finish on its own worker, only changing a copy of the old game,
+        # and the next game's turns are computed on a new worker and copy
+        if self._turn is not None:
+            if not self._turn[1].cancel():
+                self._workers.shutdown(wait=False)
+                self._workers = ThreadPoolExecutor(max_workers=1)
+            self._turn = None
+        self._shadow = None
+
+    def end_game(self):
+        """Announce the winner and close the application."""
+        self._pending = None
+
+        # draw the final board before announcing the winner
+        self._scheduler.flush()
+        self._scheduler.stop()
+        messagebox.showinfo("Game Over",
+                            f"{self.game.winner.get_name()} has won!")
+        self._master.destroy()
+
     def play(self):
         """Start the game running"""
         self.step()
 
 
-def main():
+def instrument(profiler):
+    """Measure the drawing of the graphical interface with a profiler.
+
+    Every redraw of the board is a frame. The time taken to diff the board
+    model, to apply its operations to the decks and cards and the calls made
+    to each deck's canvas are recorded.
+
+    Parameters:
+        profiler (FrameProfiler): The profiler to install.
+    """
+    profiler.frame(UnoApp, "update")
+    profiler.time(BoardModel, "render")
+    profiler.time(TkBackend, "apply")
+    profiler.time(DeckView, "refresh")
+    profiler.time(CardView, "paint")
+    profiler.count(DeckView, *CANVAS_CALLS)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play Uno.")
+    parser.add_argument("--strategies", default=BASELINE,
+                        help="comma separated strategy of each computer player, from: "
+                             + ", ".join(STRATEGIES))
+    parser.add_argument("--speed", choices=SPEEDS, default="Slow",
+                        help="delay before each computer turn")
+    parser.add_argument("--fast-forward", action="store_true",
+                        help="take consecutive computer turns without waiting")
+    parser.add_argument("--profile", nargs="?", const="", metavar="REPORT",
+                        help="show the time and canvas calls of each frame, "
+                             "writing a JSON report to REPORT on exit")
+    args = parser.parse_args(argv)
+
+    profiler = None
+    if args.profile is not None:
+        profiler = FrameProfiler()
+        instrument(profiler)
+
     # create window for uno
     root = tk.Tk()
     root.title("Uno")
 
     # build a list of players for the game
-    players = [HumanPlayer("Steven"), HumanPlayer(generate_name()),
-               ComputerPlayer(generate_name())]
+    players = [HumanPlayer("Steven"), HumanPlayer(generate_name())]
+    for strategy in parse_strategies(args.strategies):
+        players.append(strategy(generate_name()))
 
     # build a pickup pile
     pickup_pile = Deck(build_deck(FULL_DECK))
     pickup_pile.shuffle()
 
     # deal players cards from the pickup pile
-    for player in players:
-        cards = pickup_pile.pick(7)
-        player.get_deck().add_cards(cards)
+    pickup_pile.deal(players)
 
     # create and play the game
-    game = UnoGame(pickup_pile, players)
-    app = UnoApp(root, game)
+    game = UnoGame(pickup_pile, players, recycle=True)
+    app = UnoApp(root, game, delay=SPEEDS[args.speed], fast_forward=args.fast_forward,
+                 profiler=profiler)
     app.play()
 
     # update window dimensions
@@ -581,6 +1001,9 @@ def main():
     root.minsize(root.winfo_width(), root.winfo_height())
     root.mainloop()
 
+    if profiler is not None and args.profile:
+        profiler.dump(args.profile)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,284 @@
+"""
+Opt-in instrumentation of where the time and canvas calls of the graphical
+interface go.
+
+A FrameProfiler wraps methods of the interface's classes to time them and to
+count the calls made to its canvases, grouping the counts into frames that end
+each time the board is redrawn. The graphical interface installs one with:
+
+    python -m gui --profile report.json
+
+which shows the latest frame in an overlay and writes the report on exit.
+"""
+import json
+import time
+import weakref
+from collections import Counter, defaultdict, deque
+from functools import wraps
+
+# the most frames and timings of each method kept for the report, older
+# ones are only kept in the totals
+FRAME_LOG = 1000
+TIMING_LOG = 10000
+
+
+def percentile(values, percent):
+    """
+    (float) Returns the value within which the given percent of the sorted
+    values fall, or 0 if there are no values.
+    """
+    if not values:
+        return 0.0
+    rank = max(int(round(percent / 100 * len(values))) - 1, 0)
+    return values[rank]
+
+
+class FrameProfiler:
+    """
+    Times methods and counts calls, grouped by frame and by the object called.
+
+    Methods are wrapped on their class, so every instance is measured until
+    the profiler is uninstalled.
+    """
+    def __init__(self, clock=time.perf_counter):
+        """
+        Construct a profiler which has not wrapped any methods.
+
+        Parameters:
+            clock (callable): Returns the current time in seconds.
+        """
+        self._clock = clock
+
+        # the original attributes of each wrapped method, to be restored
+        self._patched = []
+
+        # the name each counted object is reported under
+        self._names = weakref.WeakKeyDictionary()
+
+        # the seconds taken by the latest calls of every timed method, and
+        # the amount of calls and seconds taken in total
+        self.timings = defaultdict(lambda: deque(maxlen=TIMING_LOG))
+        self._totals = defaultdict(lambda: [0, 0.0])
+
+        # the calls counted since the last frame ended and in every frame
+        self._calls = Counter()
+        self._object_calls = defaultdict(Counter)
+        self.calls = Counter()
+        self.object_calls = defaultdict(Counter)
+
+        self.frames = 0
+        self.frame_log = deque(maxlen=FRAME_LOG)
+
+        self._listener = None
+
+    def _patch(self, cls, name, wrapper):
+        """
+        Replace a method of a class with a wrapper of it.
+
+        Parameters:
+            cls (type): The class to patch.
+            name (str): The name of the method.
+            wrapper (callable): Takes the method and returns its replacement.
+        """
+        original = cls.__dict__.get(name)
+        self._patched.append((cls, name, original))
+        setattr(cls, name, wraps(getattr(cls, name))(wrapper(getattr(cls, name))))
+
+    def time(self, cls, name, label=None):
+        """
+        Time every call of a method.
+
+        Parameters:
+            cls (type): The class of the method.
+            name (str): The name of the method.
+            label (str): The name the timings are reported under,
+                         "Class.method" by default.
+        """
+        label = label or "{}.{}".format(cls.__name__, name)
+        clock = self._clock
+
+        def wrapper(method):
+            def timed(*args, **kwargs):
+                start = clock()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    self._record(label, clock() - start)
+            return timed
+
+        self._patch(cls, name, wrapper)
+
+    def frame(self, cls, name, label=None):
+        """
+        Time every call of a method which draws a frame, ending the frame once
+        it returns.
+
+        Parameters:
+            cls (type): The class of the method.
+            name (str): The name of the method.
+            label (str): The name the timings are reported under,
+                         "Class.method" by default.
+        """
+        label = label or "{}.{}".format(cls.__name__, name)
+        clock = self._clock
+
+        def wrapper(method):
+            def framed(*args, **kwargs):
+                start = clock()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    self.end_frame(label, clock() - start)
+            return framed
+
+        self._patch(cls, name, wrapper)
+
+    def count(self, cls, *names):
+        """
+        Count every call of the given methods, by method and by the object
+        the method was called on.
+
+        Parameters:
+            cls (type): The class of the methods.
+            names (str): The names of the methods.
+        """
+        for name in names:
+            def wrapper(method, name=name):
+                def counted(instance, *args, **kwargs):
+                    self._calls[name] += 1
+                    self._object_calls[self.name_of(instance)][name] += 1
+                    return method(instance, *args, **kwargs)
+                return counted
+
+            self._patch(cls, name, wrapper)
+
+    def name(self, instance, name):
+        """
+        Report the calls counted on an object under a name.
+
+        Parameters:
+            instance (object): The object the counted methods are called on.
+            name (str): The name to report it under.
+        """
+        self._names[instance] = name
+
+    def name_of(self, instance):
+        """(str) Returns the name the calls on an object are reported under."""
+        return self._names.get(instance) or str(instance)
+
+    def end_frame(self, label, seconds):
+        """
+        Record the calls counted since the last frame as a frame.
+
+        Parameters:
+            label (str): The name of the method which drew the frame.
+            seconds (float): The time taken to draw the frame.
+        """
+        self._record(label, seconds)
+        self.frames += 1
+
+        self.calls.update(self._calls)
+        for name, calls in self._object_calls.items():
+            self.object_calls[name].update(calls)
+
+        self.frame_log.append({
+            "ms": seconds * 1e3,
+            "calls": dict(self._calls),
+            "objects": {name: sum(calls.values()) for name, calls in self._object_calls.items()},
+        })
+        self._calls = Counter()
+        self._object_calls = defaultdict(Counter)
+
+        if self._listener is not None:
+            self._listener(self)
+
+    def _record(self, label, seconds):
+        """
+        Record the seconds taken by a call of a timed method.
+
+        Parameters:
+            label (str): The name the timings are reported under.
+            seconds (float): The time taken by the call.
+        """
+        self.timings[label].append(seconds)
+        totals = self._totals[label]
+        totals[0] += 1
+        totals[1] += seconds
+
+    def set_listener(self, listener):
+        """
+        Set the function called after each frame is recorded.
+
+        Parameters:
+            listener (callable): Called with the profiler, or None to stop notifying.
+        """
+        self._listener = listener
+
+    def last_frame(self):
+        """(dict) Returns the latest frame recorded, or None if none have been."""
+        return self.frame_log[-1] if self.frame_log else None
+
+    def uninstall(self):
+        """
+        Restore every method wrapped by the profiler.
+        """
+        while self._patched:
+            cls, name, original = self._patched.pop()
+            if original is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, original)
+
+    def report(self):
+        """
+        Summarise everything measured.
+
+        Returns:
+            (dict): The calls, mean and total milliseconds of every timed
+                    method and the p50 and p99 of its latest calls, the calls
+                    counted in total, per frame and on each object and the
+                    most recent frames.
+        """
+        timings = {}
+        for label, (calls, seconds) in self._totals.items():
+            ordered = sorted(self.timings[label])
+            timings[label] = {
+                "calls": calls,
+                "p50_ms": percentile(ordered, 50) * 1e3,
+                "p99_ms": percentile(ordered, 99) * 1e3,
+                "mean_ms": seconds / calls * 1e3,
+                "total_ms": seconds * 1e3,
+            }
+
+        frames = max(self.frames, 1)
+        return {
+            "frames": self.frames,
+            "timings": timings,
+            "calls": dict(self.calls),
+            "calls_per_frame": {name: calls / frames for name, calls in self.calls.items()},
+            "objects": {name: dict(calls) for name, calls in self.object_calls.items()},
+            "frame_log": list(self.frame_log),
+        }
+
+    def dump(self, path):
+        """
+        Write the report as JSON.
+
+        Parameters:
+            path (str): The file to write.
+        """
+        with open(path, "w") as file:
+            json.dump(self.report(), file, indent=2)
+
+    def __str__(self):
+        """
+        Return a one line summary of the latest frame, as shown in an overlay.
+        """
+        frame = self.last_frame()
+        if frame is None:
+            return "no frames"
+
+        ordered = sorted(entry["ms"] for entry in self.frame_log)
+        return "frame {:.2f} ms (p50 {:.2f}, p99 {:.2f})  {} canvas calls  {} frames".format(
+            frame["ms"], percentile(ordered, 50), percentile(ordered, 99),
+            sum(frame["calls"].values()), self.frames)
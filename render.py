@@ -0,0 +1,331 @@
+"""
+A toolkit independent model of what the Uno board looks like.
+
+BoardModel turns the state of an UnoGame into a frame, a dictionary of what
+is drawn in each part of the board, and diffs it against the previous frame
+into draw operations. A backend applies the operations: the Tk interface in
+gui draws them on canvases, while RecordingBackend only records them so that
+rendering can be tested and measured without a display:
+
+    python -m render --games 100 --players 4
+"""
+import argparse
+import time
+from collections import namedtuple
+
+from instrument import percentile
+from simulate import HAND_SIZE, MAX_TURNS, new_game
+from uno import SkipCard, ReverseCard, Pickup2Card, Pickup4Card
+from uno_util import derive_seed
+
+CARD_OVAL_COLOUR = "#fceee3"
+CARD_BACK_BACKGROUND = "black"
+CARD_BACK_FOREGROUND = "red"
+CARD_BACK_TEXT_COLOUR = "yellow"
+CARD_BACK_TEXT = "UNO"
+
+CARD_ICONS = {
+    SkipCard: "skip",
+    ReverseCard: "reverse"
+}
+
+PICKUP_CARDS = (Pickup2Card, Pickup4Card)
+
+# the parts of the board besides the seats, which are numbered from 0
+PUTDOWN = "putdown"
+PICKUP = "pickup"
+SPECIAL = "special"
+
+# the properties of a part of the board other than its card slots
+SIZE = "size"
+PLAYING = "playing"
+ACTIVE = "active"
+NAME = "name"
+
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+
+Face = namedtuple("Face", ["background", "oval", "icon", "text", "text_colour"])
+Face.__doc__ = """
+The appearance of one side of a card: its background colour, the colour of
+the oval in its middle or None, the name of the icon in its middle or None and
+its text and text colour.
+"""
+
+DrawOp = namedtuple("DrawOp", ["action", "part", "key", "value"])
+DrawOp.__doc__ = """
+A change to the board: an action of CREATE, UPDATE or DELETE on a key of a
+part of the board. Keys are card slots or SIZE, PLAYING, ACTIVE and NAME, the
+value is a Face for card slots and None when deleting.
+"""
+
+BACK_FACE = Face(CARD_BACK_BACKGROUND, CARD_BACK_FOREGROUND, None,
+                 CARD_BACK_TEXT, CARD_BACK_TEXT_COLOUR)
+
+_FACES = {}
+
+
+def card_face(card, oval_colour=CARD_OVAL_COLOUR):
+    """
+    Return the appearance of the front of a card.
+
+    Skip and reverse cards show an icon, pickup cards the amount of cards to
+    pickup and other cards their number.
+
+    Parameters:
+        card (Card): The card to draw.
+        oval_colour (str): The colour of the oval for cards without an icon.
+
+    Returns:
+        (Face): The front of the card.
+    """
+    key = (card, oval_colour)
+    face = _FACES.get(key) if card.is_interned() else None
+    if face is not None:
+        return face
+
+    colour = card.get_colour().value
+    icon = CARD_ICONS.get(card.__class__)
+    if icon is not None:
+        face = Face(colour, None, icon, "", colour)
+    elif card.__class__ in PICKUP_CARDS:
+        face = Face(colour, oval_colour, None, f"+{card.get_pickup_amount()}", colour)
+    else:
+        face = Face(colour, oval_colour, None, str(card.get_number()), colour)
+
+    # cards which are not interned can change, so are not cached
+    if card.is_interned():
+        _FACES[key] = face
+    return face
+
+
+def deck_faces(deck, show=True, top_only=False):
+    """
+    Return the appearance of every card slot of a deck.
+
+    Parameters:
+        deck (Deck): The deck to draw.
+        show (bool): Whether the fronts of the cards are shown.
+        top_only (bool): Whether only the top card can be seen, as in a pile
+                         with every card drawn in the same place.
+
+    Returns:
+        (dict<int, Face>): The face drawn in each slot.
+    """
+    cards = deck.get_cards()
+    slots = range(max(len(cards) - 1, 0), len(cards)) if top_only else range(len(cards))
+    if not show:
+        return {slot: BACK_FACE for slot in slots}
+    return {slot: card_face(cards[slot]) for slot in slots}
+
+
+def diff(previous, current):
+    """
+    Find the draw operations which change one frame into another.
+
+    Parameters:
+        previous (dict<tuple, object>): The previous frame, keyed by part and key.
+        current (dict<tuple, object>): The next frame.
+
+    Returns:
+        (list<DrawOp>): The deletions, followed by the creations and updates
+                        in the order of the next frame.
+    """
+    ops = [DrawOp(DELETE, part, key, None)
+           for part, key in previous if (part, key) not in current]
+
+    for (part, key), value in current.items():
+        old = previous.get((part, key), previous)
+        if old is previous:
+            ops.append(DrawOp(CREATE, part, key, value))
+        elif old != value:
+            ops.append(DrawOp(UPDATE, part, key, value))
+    return ops
+
+
+class BoardModel:
+    """
+    The frames of the board of a game, as drawn by UnoApp.
+
+    Each part of the board is only rebuilt and diffed when the version of its
+    deck or its flags change, so the work done each frame is proportional to
+    what changed.
+    """
+    def __init__(self):
+        """
+        Construct a model which has not drawn a frame.
+        """
+        # the signature and frame entries each part of the board was last drawn with
+        self._parts = {}
+
+    def parts(self, game):
+        """
+        Describe each part of the board of a game.
+
+        Parameters:
+            game (UnoGame): The game to draw.
+
+        Returns:
+            (list<tuple>): The name, deck, visibility, whether only the top card
+                           can be seen and the properties of each part.
+        """
+        current = game.current_player()
+        parts = []
+        for seat, player in enumerate(game.players):
+            playing = player is current
+            clickable = player.is_playable() and playing
+            parts.append((seat, player.get_deck(), clickable, False,
+                          {PLAYING: playing, ACTIVE: clickable, NAME: player.get_name()}))
+
+        parts.append((PUTDOWN, game.putdown_pile, True, False, {}))
+        parts.append((PICKUP, game.pickup_pile, False, True, {}))
+        parts.append((SPECIAL, game.special_pile, True, True, {}))
+        return parts
+
+    def render(self, game):
+        """
+        Draw the next frame of a game.
+
+        Parameters:
+            game (UnoGame): The game to draw.
+
+        Returns:
+            (list<DrawOp>): The operations changing the last frame into this one.
+        """
+        ops = []
+        seen = set()
+        for name, deck, show, top_only, properties in self.parts(game):
+            seen.add(name)
+            signature = (deck, deck.get_version(), show, top_only, tuple(properties.items()))
+
+            last = self._parts.get(name)
+            if last is not None and last[0] == signature:
+                continue
+
+            entries = {(name, SIZE): deck.get_amount()}
+            for key, value in properties.items():
+                entries[(name, key)] = value
+            for slot, face in deck_faces(deck, show, top_only).items():
+                entries[(name, slot)] = face
+
+            ops.extend(diff({} if last is None else last[1], entries))
+            self._parts[name] = (signature, entries)
+
+        # remove the parts of seats which have left
+        for name in [name for name in self._parts if name not in seen]:
+            ops.extend(diff(self._parts.pop(name)[1], {}))
+
+        return ops
+
+    def frame(self):
+        """
+        (dict<tuple, object>) Returns the whole of the last frame drawn, keyed
+        by part and key.
+        """
+        frame = {}
+        for _, entries in self._parts.values():
+            frame.update(entries)
+        return frame
+
+
+class RecordingBackend:
+    """
+    A backend which keeps the frame built by the draw operations applied to
+    it and counts them, instead of drawing anything.
+    """
+    def __init__(self):
+        """
+        Construct a backend which has not applied any operations.
+        """
+        self.frame = {}
+        self.frames = 0
+        self.counts = {CREATE: 0, UPDATE: 0, DELETE: 0}
+        self.ops = []
+
+    def apply(self, ops):
+        """
+        Apply the draw operations of a frame.
+
+        Parameters:
+            ops (list<DrawOp>): The operations to apply.
+        """
+        self.frames += 1
+        for op in ops:
+            self.counts[op.action] += 1
+            if op.action == DELETE:
+                del self.frame[(op.part, op.key)]
+            else:
+                self.frame[(op.part, op.key)] = op.value
+        self.ops.extend(ops)
+
+    def total(self):
+        """(int) Returns the amount of operations applied."""
+        return sum(self.counts.values())
+
+
+def benchmark(games, player_count, hand_size=HAND_SIZE, max_turns=MAX_TURNS, seed=0):
+    """
+    Measure the cost of rendering every turn of a batch of games.
+
+    Parameters:
+        games (int): The amount of games to play.
+        player_count (int): The amount of computer players in each game.
+        hand_size (int): The amount of cards dealt to each player.
+        max_turns (int): The amount of turns after which a game is abandoned.
+        seed (int): The master seed the seed of every game is derived from.
+
+    Returns:
+        (tuple<RecordingBackend, list<float>>): The backend the frames were
+            applied to and the seconds taken to render and apply each frame.
+    """
+    backend = RecordingBackend()
+    times = []
+    for index in range(games):
+        game = new_game(player_count, hand_size=hand_size, seed=derive_seed(seed, index))
+        model = BoardModel()
+        backend.frame = {}
+
+        turns = 0
+        while not game.is_over() and turns < max_turns:
+            player = game.next_player()
+            game.take_turn(player)
+            turns += 1
+
+            start = time.perf_counter()
+            backend.apply(model.render(game))
+            times.append(time.perf_counter() - start)
+
+    return backend, times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the cost of rendering games of Uno.")
+    parser.add_argument("--games", type=int, default=100,
+                        help="amount of games to render")
+    parser.add_argument("--players", type=int, default=4,
+                        help="amount of computer players in each game")
+    parser.add_argument("--hand-size", type=int, default=HAND_SIZE,
+                        help="amount of cards dealt to each player")
+    parser.add_argument("--max-turns", type=int, default=MAX_TURNS,
+                        help="amount of turns after which a game is abandoned")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="master seed of the games")
+    args = parser.parse_args(argv)
+
+    backend, times = benchmark(args.games, args.players, hand_size=args.hand_size,
+                               max_turns=args.max_turns, seed=args.seed)
+    times.sort()
+    frames = max(len(times), 1)
+    print("frames:      {}".format(len(times)))
+    print("ops/frame:   {:.1f} ({} create, {} update, {} delete)".format(
+        backend.total() / frames, backend.counts[CREATE], backend.counts[UPDATE],
+        backend.counts[DELETE]))
+    if times:
+        print("us/frame:    p50 {:.1f} / p99 {:.1f} / mean {:.1f}".format(
+            percentile(times, 50) * 1e6, percentile(times, 99) * 1e6,
+            sum(times) / len(times) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
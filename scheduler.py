@@ -0,0 +1,150 @@
+"""
+A single loop of ticks driving the callbacks of the graphical interface.
+
+Changes to the game only mark the board as needing a redraw, and delayed work
+such as computer turns and animations is queued as tasks. Each tick runs the
+tasks which are due and then redraws the board at most once, however many
+changes were made, with ticks no closer together than a frame.
+"""
+import itertools
+import math
+import time
+
+# the milliseconds between ticks
+FRAME_TIME = 1000 // 30
+
+
+class FrameScheduler:
+    """
+    Coalesces redraws and runs delayed tasks on ticks scheduled with the
+    after and after_cancel methods of a Tk widget.
+
+    The scheduler only ticks while there is a redraw or a task waiting, so
+    an idle application does not wake up. A task which should run every
+    tick, such as an animation, queues itself again with a delay of 0.
+    """
+    def __init__(self, master, render, interval=FRAME_TIME, clock=time.perf_counter):
+        """
+        Construct a scheduler with nothing to do.
+
+        Parameters:
+            master (tk.Misc): The widget to schedule ticks with.
+            render (callable): Redraws everything which has changed.
+            interval (int): The fewest milliseconds between ticks.
+            clock (callable): Returns the current time in seconds.
+        """
+        self._master = master
+        self._render = render
+        self._interval = interval / 1000
+        self._clock = clock
+
+        # the due time and callback of each queued task, by handle
+        self._tasks = {}
+        self._handles = itertools.count()
+
+        self._dirty = False
+
+        # the scheduled tick and when it is due, and when the last tick ran
+        self._tick = None
+        self._tick_time = None
+        self._last_tick = -math.inf
+
+        self.ticks = 0
+        self.renders = 0
+
+    def invalidate(self):
+        """
+        Mark the board as changed, to be redrawn on the next tick.
+        """
+        self._dirty = True
+        self._wake()
+
+    def call_later(self, delay, callback):
+        """
+        Queue a task to run on the first tick after a delay.
+
+        Parameters:
+            delay (int): The milliseconds to wait, 0 to run on the next tick.
+            callback (callable): The task, taking no arguments.
+
+        Returns:
+            (int): A handle to cancel the task with.
+        """
+        handle = next(self._handles)
+        self._tasks[handle] = (self._clock() + delay / 1000, callback)
+        self._wake()
+        return handle
+
+    def cancel(self, handle):
+        """
+        Remove a queued task, if it has not run.
+
+        Parameters:
+            handle (int): The handle returned when the task was queued.
+        """
+        self._tasks.pop(handle, None)
+
+    def flush(self):
+        """
+        Redraw now if anything has changed, rather than on the next tick.
+        """
+        if self._dirty:
+            self._dirty = False
+            self._render()
+            self.renders += 1
+
+    def stop(self):
+        """
+        Remove every queued task and redraw, and cancel the next tick.
+        """
+        self._tasks.clear()
+        self._dirty = False
+        if self._tick is not None:
+            self._master.after_cancel(self._tick)
+            self._tick = self._tick_time = None
+
+    def pending(self):
+        """(int) Returns the amount of tasks queued."""
+        return len(self._tasks)
+
+    def _wake(self):
+        """
+        Schedule a tick for when the next redraw or task is due, no sooner
+        than a frame after the last tick.
+        """
+        if self._dirty:
+            due = self._clock()
+        elif self._tasks:
+            due = min(when for when, _ in self._tasks.values())
+        else:
+            return
+
+        due = max(due, self._last_tick + self._interval)
+        if self._tick is not None:
+            if self._tick_time <= due:
+                return
+            self._master.after_cancel(self._tick)
+
+        delay = max(math.ceil((due - self._clock()) * 1000), 0)
+        self._tick = self._master.after(delay, self.tick)
+        self._tick_time = due
+
+    def tick(self):
+        """
+        Run the tasks which are due, then redraw if anything has changed.
+
+        Tasks queued while ticking run on a later tick, after the redraw.
+        """
+        self._tick = self._tick_time = None
+        now = self._last_tick = self._clock()
+        self.ticks += 1
+
+        due = sorted((when, handle) for handle, (when, _) in self._tasks.items()
+                     if when <= now)
+        for _, handle in due:
+            task = self._tasks.pop(handle, None)
+            if task is not None:
+                task[1]()
+
+        self.flush()
+        self._wake()
@@ -0,0 +1,268 @@
+"""
+Computer players which search for their moves by playing out the rest of the
+game many times.
+
+A Monte Carlo player can be seated like any other player, for example in a
+tournament with:
+
+    python -m tournament --players MonteCarloPlayer,ComputerPlayer
+"""
+import math
+import time
+from collections import Counter
+
+from cache import CachedPlayer, DecisionCache
+from uno import ComputerPlayer, matches
+from uno_util import make_random
+
+BUDGET = 50
+ROLLOUT_TURNS = 500
+EXPLORATION = math.sqrt(2)
+MAX_POSITIONS = 100000
+
+# how quickly the estimated cost of setting up a playout falls after a slow one
+SETUP_DECAY = 0.9
+
+
+class MonteCarloPlayer(ComputerPlayer):
+    """
+    A computer player which plays the card that wins most often when the rest
+    of the game is played out by players who play the first matching card.
+
+    This is flat Monte Carlo: only the cards playable now are scored, and
+    every later move of a playout is made by the first matching card rule
+    rather than searched. The other players' hands are hidden, so before each
+    playout the cards this player can not see are shuffled and dealt again to
+    the other players and the pickup pile. Cards to play out are chosen with
+    UCB1, and the scores are kept for every position the player has searched,
+    so searching carries on where it left off if the same hand, top card and
+    hand sizes come up on a later turn.
+    """
+    def __init__(self, name, budget=BUDGET, rollouts=None, rng=None):
+        """
+        Construct a Monte Carlo player.
+
+        Parameters:
+            name (str): The name of the player.
+            budget (float): The milliseconds the player may search for each move.
+            rollouts (int): The most playouts to search for each move, or None
+                            to search until the budget runs out.
+            rng (random.Random|int): The random number generator used to deal
+                                     hidden hands, or a seed for one.
+        """
+        super().__init__(name)
+        self._budget = budget
+        self._rollouts = rollouts
+        self._random = make_random(rng)
+        self._game = None
+        self._positions = {}
+
+        # the estimated seconds taken to copy and deal the game for a playout
+        self._setup = 0.0
+
+    def join(self, game):
+        """
+        Remember the game to play out and forget the results and timings of
+        any other game.
+
+        Parameters:
+            game (UnoGame): The game the player is seated in.
+        """
+        self._game = game
+        self._positions = {}
+        self._setup = 0.0
+
+    def clone(self):
+        """
+        (MonteCarloPlayer) Returns a new player with the same name, budget and
+        playout limit, holding no cards, which deals hidden hands with its own
+        generator seeded from this player's.
+        """
+        return self.__class__(self.get_name(), budget=self._budget, rollouts=self._rollouts,
+                              rng=self._random.getrandbits(64))
+
+    def get_budget(self):
+        """(float) Returns the milliseconds the player may search for each move."""
+        return self._budget
+
+    def pick_card(self, putdown_pile):
+        """
+        Selects a card to play from the players current deck.
+
+        Parameters:
+            putdown_pile (Deck): The pile of cards played on.
+
+        Returns:
+            (Card): The card which won the most playouts, or the first matching
+                    card if there was no time to play any out. None if no
+                    card matches.
+        """
+        deadline = time.perf_counter() + self._budget / 1000
+        hand = self.get_deck()
+        candidates = self._candidates(hand, putdown_pile.top())
+        if not candidates:
+            return None
+
+        card = candidates[0]
+        if len(candidates) > 1 and self._game is not None:
+            card = self._search(candidates, putdown_pile.top(), deadline)
+
+        hand.remove(card)
+        return card
+
+    def _candidates(self, hand, top):
+        """
+        (list<Card>) Returns every distinct card in the hand which matches top,
+        in the order they were added to the hand.
+        """
+        candidates = {}
+        for card in hand.get_cards():
+            if card not in candidates and matches(card, top):
+                candidates[card] = None
+        return list(candidates)
+
+    def _scores(self, candidates, top):
+        """
+        (dict<Card, list>) Returns the visits and wins of each candidate card
+        in the current position.
+        """
+        sizes = tuple(self._game.get_hand_size(player) for player in self._game.players)
+        key = (top, frozenset(Counter(self.get_deck().get_cards()).items()), sizes)
+
+        scores = self._positions.get(key)
+        if scores is None:
+            if len(self._positions) >= MAX_POSITIONS:
+                self._positions.clear()
+            scores = self._positions[key] = {card: [0, 0.0] for card in candidates}
+        return scores
+
+    def _search(self, candidates, top, deadline):
+        """
+        (Card) Returns the candidate card which was played out the most before
+        the deadline, preferring earlier candidates on ties.
+        """
+        scores = self._scores(candidates, top)
+
+        rollouts = 0
+        # only start another playout if there is time to set it up and play a
+        # turn, but always try one so a slow set up is measured again and its
+        # estimate can fall rather than stopping every later search
+        while rollouts != self._rollouts and \
+                time.perf_counter() + (self._setup if rollouts else 0.0) < deadline:
+            card = self._select(scores)
+            reward = self._rollout(card, deadline)
+            if reward is None:
+                break
+
+            stats = scores[card]
+            stats[0] += 1
+            stats[1] += reward
+            rollouts += 1
+
+        return max(candidates, key=lambda card: scores[card][0])
+
+    def _select(self, scores):
+        """
+        (Card) Returns the card to play out next by UCB1.
+        """
+        total = math.log(max(sum(visits for visits, _ in scores.values()), 1))
+
+        best, best_score = None, -1
+        for card, (visits, wins) in scores.items():
+            if visits == 0:
+                return card
+            score = wins / visits + EXPLORATION * math.sqrt(total / visits)
+            if score > best_score:
+                best, best_score = card, score
+        return best
+
+    def _rollout(self, card, deadline):
+        """
+        Play out the rest of the game after playing a card.
+
+        Parameters:
+            card (Card): The card to play from this player's hand.
+            deadline (float): The time.perf_counter value to stop playing at.
+
+        Returns:
+            (float): 1 if this player won, 0 if another player won or 0.5 if
+                     the game ran out of turns. None if the deadline passed.
+        """
+        start = time.perf_counter()
+        seat = self._game.players.index(self)
+        players = [ComputerPlayer(player.get_name()) for player in self._game.players]
+        game = self._game.clone(players, rng=self._random.getrandbits(64))
+        self._determinize(game, seat)
+
+        try:
+            # remember slow set ups for longer than fast ones, so the budget
+            # is only overrun when setting up is much slower than it has been
+            now = time.perf_counter()
+            self._setup = max(now - start, self._setup * SETUP_DECAY)
+            if now >= deadline:
+                return None
+
+            return self._play_out(game, players[seat], card, deadline)
+        finally:
+            # the hands refer back to the game through their listeners, so
+            # unhook them to free the copy now rather than in a collection
+            for player in players:
+                player.get_deck().set_listener(None)
+
+    def _play_out(self, game, player, card, deadline):
+        """
+        (float) Returns the reward of playing a card in a copy of the game and
+        taking turns until it ends, as returned by _rollout.
+        """
+        player.get_deck().remove(card)
+        game.select_card(player, card)
+
+        turns = 0
+        while not game.is_over():
+            if time.perf_counter() >= deadline:
+                return None
+            if turns >= ROLLOUT_TURNS:
+                return 0.5
+            game.take_turn(game.next_player())
+            turns += 1
+
+        return 1.0 if game.winner is player else 0.0
+
+    def _determinize(self, game, seat):
+        """
+        Deal the cards hidden from the player in a seat to the other players
+        and the pickup pile of a game at random.
+
+        Parameters:
+            game (UnoGame): A clone of the game this player is seated in.
+            seat (int): The index of this player in the game.
+        """
+        hands = [player.get_deck() for index, player in enumerate(game.players)
+                 if index != seat]
+
+        unseen = list(game.pickup_pile.get_cards())
+        for hand in hands:
+            unseen.extend(hand.get_cards())
+        game.get_random().shuffle(unseen)
+
+        start = 0
+        for hand in hands:
+            amount = hand.get_amount()
+            # add the new cards before removing the old ones, so the hand is
+            # never empty and the game is not ended
+            hand.add_cards(unseen[start:start + amount])
+            hand.clear(keep=amount)
+            start += amount
+
+        game.pickup_pile.clear()
+        game.pickup_pile.add_cards(unseen[start:])
+
+
+class CachedMonteCarloPlayer(CachedPlayer, MonteCarloPlayer):
+    """
+    A Monte Carlo player which searches each position once, playing the same
+    card whenever it holds the same hand against the same top card and hand
+    sizes. The cache is shared by every cached Monte Carlo player.
+    """
+    cache = DecisionCache()
+    cache_sizes = True
@@ -0,0 +1,265 @@
+"""
+Headless simulation of Uno games between computer players.
+
+Run a batch of games from the command line with:
+
+    python -m simulate --games 1000 --players 4
+"""
+import argparse
+import random
+import time
+
+from uno import ComputerPlayer, Deck
+from uno_util import FULL_DECK, build_deck, UnoGame, derive_seed, make_random
+
+HAND_SIZE = 7
+MAX_TURNS = 10000
+
+
+class GameResult:
+    """
+    The outcome of a single simulated game.
+    """
+    def __init__(self, turns, winner=None, seed=None):
+        """
+        Construct the result of a game.
+
+        Parameters:
+            turns (int): The amount of turns taken in the game.
+            winner (int): The seat of the winning player, or None if the game
+                          was abandoned before anyone won.
+            seed (int): The seed the game was played with, if any.
+        """
+        self.turns = turns
+        self.winner = winner
+        self.seed = seed
+
+    def is_finished(self):
+        """
+        (bool): True iff a player won the game.
+        """
+        return self.winner is not None
+
+
+class BatchReport:
+    """
+    Throughput and turn statistics for a batch of simulated games.
+    """
+    def __init__(self, results, elapsed, seed=None):
+        """
+        Construct a report from the results of a batch.
+
+        Parameters:
+            results (list<GameResult>): The results of every game in the batch.
+            elapsed (float): The wall-clock seconds taken by the batch.
+            seed (int): The master seed the game seeds were derived from.
+        """
+        self.results = results
+        self.elapsed = elapsed
+        self.seed = seed
+
+    def get_games(self):
+        """(int) Returns the amount of games simulated."""
+        return len(self.results)
+
+    def get_turns(self):
+        """(list<int>) Returns the amount of turns taken in each game."""
+        return [result.turns for result in self.results]
+
+    def get_stalled(self):
+        """(int) Returns the amount of games abandoned without a winner."""
+        return sum(1 for result in self.results if not result.is_finished())
+
+    def longest(self):
+        """(GameResult) Returns the game which took the most turns."""
+        return max(self.results, key=lambda result: result.turns)
+
+    def games_per_second(self):
+        """(float) Returns the amount of games simulated per second."""
+        if self.elapsed <= 0:
+            return float("inf")
+        return self.get_games() / self.elapsed
+
+    def turns_per_second(self):
+        """(float) Returns the amount of turns simulated per second."""
+        if self.elapsed <= 0:
+            return float("inf")
+        return sum(self.get_turns()) / self.elapsed
+
+    def __str__(self):
+        """
+        Return a human readable summary of the batch.
+        """
+        turns = self.get_turns()
+        lines = [
+            "seed:        {}".format(self.seed),
+            "games:       {}".format(self.get_games()),
+            "stalled:     {}".format(self.get_stalled()),
+            "elapsed:     {:.3f}s".format(self.elapsed),
+            "games/sec:   {:.1f}".format(self.games_per_second()),
+            "turns/sec:   {:.1f}".format(self.turns_per_second()),
+        ]
+        if turns:
+            lines.append("turns/game:  min {} / mean {:.1f} / max {}".format(
+                min(turns), sum(turns) / len(turns), max(turns)))
+            lines.append("longest:     game seed {}".format(self.longest().seed))
+        return "\n".join(lines)
+
+
+def new_game(player_count, hand_size=HAND_SIZE, player_classes=None, seed=None):
+    """
+    Construct a freshly shuffled and dealt game between computer players.
+
+    Parameters:
+        player_count (int): The amount of computer players to seat.
+        hand_size (int): The amount of cards dealt to each player.
+        player_classes (list<type>): The Player subclass for each seat,
+                                     ComputerPlayer for every seat if None.
+        seed (int): The seed for the game's random number generator. Games
+                    with the same seed and players are played identically.
+
+    Returns:
+        (UnoGame): The game, ready to be played.
+    """
+    rng = make_random(seed)
+
+    if player_classes is None:
+        player_classes = [ComputerPlayer] * player_count
+
+    players = [player_class("Player {}".format(seat))
+               for seat, player_class in enumerate(player_classes)]
+
+    pickup_pile = Deck(build_deck(FULL_DECK))
+    pickup_pile.set_random(rng)
+    pickup_pile.shuffle()
+
+    pickup_pile.deal(players, hand_size=hand_size)
+
+    return UnoGame(pickup_pile, players, recycle=True, rng=rng)
+
+
+def play_game(game, max_turns=MAX_TURNS, seed=None):
+    """
+    Play a game to completion without any user interface.
+
+    Turns are taken in the same order as UnoApp.step, so the first turn is
+    taken by the second player.
+
+    Parameters:
+        game (UnoGame): The game to play.
+        max_turns (int): The amount of turns after which the game is abandoned.
+        seed (int): The seed the game was constructed with, for the result.
+
+    Returns:
+        (GameResult): The outcome of the game.
+    """
+    turns = 0
+    while not game.is_over():
+        if turns >= max_turns:
+            return GameResult(turns, seed=seed)
+
+        player = game.next_player()
+        game.take_turn(player)
+        turns += 1
+
+    return GameResult(turns, game.players.index(game.winner), seed=seed)
+
+
+def replay_game(seed, player_count, hand_size=HAND_SIZE, max_turns=MAX_TURNS,
+                player_classes=None):
+    """
+    Replay a single game of a batch from its seed.
+
+    Parameters:
+        seed (int): The seed of the game, as in GameResult.seed.
+        player_count (int): The amount of computer players in the game.
+        hand_size (int): The amount of cards dealt to each player.
+        max_turns (int): The amount of turns after which the game is abandoned.
+        player_classes (list<type>): The Player subclass for each seat,
+                                     ComputerPlayer for every seat if None.
+
+    Returns:
+        (GameResult): The outcome of the game.
+    """
+    game = new_game(player_count, hand_size=hand_size, player_classes=player_classes,
+                    seed=seed)
+    return play_game(game, max_turns=max_turns, seed=seed)
+
+
+def run_batch(games, player_count, hand_size=HAND_SIZE, max_turns=MAX_TURNS,
+              seed=None, player_classes=None):
+    """
+    Simulate a batch of games and measure their throughput.
+
+    Parameters:
+        games (int): The amount of games to simulate.
+        player_count (int): The amount of computer players in each game.
+        hand_size (int): The amount of cards dealt to each player.
+        max_turns (int): The amount of turns after which a game is abandoned.
+        seed (int): The master seed the seed of every game is derived from,
+                    chosen at random if None.
+        player_classes (list<type>): The Player subclass for each seat,
+                                     ComputerPlayer for every seat if None.
+
+    Returns:
+        (BatchReport): The statistics for the batch.
+    """
+    if seed is None:
+        seed = random.getrandbits(32)
+
+    results = []
+    start = time.perf_counter()
+    for index in range(games):
+        results.append(replay_game(derive_seed(seed, index), player_count,
+                                   hand_size=hand_size, max_turns=max_turns,
+                                   player_classes=player_classes))
+    elapsed = time.perf_counter() - start
+
+    return BatchReport(results, elapsed, seed=seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate headless games of Uno.")
+    parser.add_argument("--games", type=int, default=1000,
+                        help="amount of games to simulate")
+    parser.add_argument("--players", type=int, default=4,
+                        help="amount of computer players in each game")
+    parser.add_argument("--hand-size", type=int, default=HAND_SIZE,
+                        help="amount of cards dealt to each player")
+    parser.add_argument("--max-turns", type=int, default=MAX_TURNS,
+                        help="amount of turns after which a game is abandoned")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="master seed of the batch, chosen at random if omitted")
+    parser.add_argument("--replay", type=int, default=None, metavar="GAME_SEED",
+                        help="replay the single game with the given game seed")
+    parser.add_argument("--strategies", default=None,
+                        help="comma separated strategy of each seat, overriding --players")
+    parser.add_argument("--show-turns", action="store_true",
+                        help="print the seed and turn count of every game")
+    args = parser.parse_args(argv)
+
+    player_classes = None
+    if args.strategies is not None:
+        # imported here as strategies builds on this module
+        from strategies import parse_strategies
+        player_classes = parse_strategies(args.strategies)
+        args.players = len(player_classes)
+
+    if args.replay is not None:
+        result = replay_game(args.replay, args.players, hand_size=args.hand_size,
+                             max_turns=args.max_turns, player_classes=player_classes)
+        print("game seed {}: {} turns, winner {}".format(result.seed, result.turns, result.winner))
+        return
+
+    report = run_batch(args.games, args.players, hand_size=args.hand_size,
+                       max_turns=args.max_turns, seed=args.seed,
+                       player_classes=player_classes)
+
+    if args.show_turns:
+        for result in report.results:
+            print("game seed {}: {} turns".format(result.seed, result.turns))
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+A registry of computer player strategies which can be selected by name.
+
+Strategies are Player subclasses, so a registered strategy can be seated in
+simulations, tournaments and the graphical interface. The latency and win
+rate of every registered strategy can be measured with:
+
+    python -m strategies --games 200 --players 4
+"""
+import argparse
+import random
+import time
+
+from instrument import percentile
+from search import CachedMonteCarloPlayer, MonteCarloPlayer
+from simulate import HAND_SIZE, MAX_TURNS, new_game, play_game
+from uno import ComputerPlayer, Pickup4Card, matches
+from uno_util import derive_seed
+
+BASELINE = "first-match"
+
+STRATEGIES = {}
+
+
+def register(name, player_class=None):
+    """
+    Register a strategy under a name, usable as a class decorator.
+
+    Parameters:
+        name (str): The name to select the strategy by.
+        player_class (type): The Player subclass which plays the strategy.
+
+    Returns:
+        (type): The player class, or a decorator registering a class if
+                player_class is None.
+
+    Raises:
+        ValueError: If another strategy is registered under the name.
+    """
+    if player_class is None:
+        return lambda player_class: register(name, player_class)
+
+    if STRATEGIES.get(name, player_class) is not player_class:
+        raise ValueError("A strategy named {} is already registered".format(name))
+    STRATEGIES[name] = player_class
+    return player_class
+
+
+def get_strategy(name):
+    """
+    Look up a registered strategy.
+
+    Parameters:
+        name (str): The name of the strategy.
+
+    Returns:
+        (type): The Player subclass which plays the strategy.
+
+    Raises:
+        ValueError: If no strategy is registered under the name.
+    """
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError("No strategy named {}, choose from {}".format(
+            name, ", ".join(STRATEGIES))) from None
+
+
+def parse_strategies(names):
+    """
+    Look up the strategies for a comma separated list of names.
+
+    Parameters:
+        names (str): Names of registered strategies, such as "first-match,random".
+
+    Returns:
+        (list<type>): The Player subclass for each name.
+    """
+    return [get_strategy(name.strip()) for name in names.split(",")]
+
+
+def card_points(card):
+    """
+    (int) Returns the points a card scores, number cards score their number,
+    wild cards 50 and other action cards 20.
+    """
+    if card.__class__ is Pickup4Card:
+        return 50
+    if card.get_number() < 0:
+        return 20
+    return card.get_number()
+
+
+def matching_cards(hand, top):
+    """
+    (list<Card>) Returns the cards in a hand which match top, in the order
+    they were added to the hand.
+    """
+    return [card for card in hand.get_cards() if matches(card, top)]
+
+
+register(BASELINE, ComputerPlayer)
+
+
+@register("hold-wilds")
+class HoldWildsPlayer(ComputerPlayer):
+    """
+    A computer player which only plays a wild card when it has no other match.
+    """
+    def pick_card(self, putdown_pile):
+        """
+        Selects a card to play from the players current deck.
+        :param putdown_pile: An instance of the Deck class
+        :return: The first matching card which isn't wild, otherwise the first
+                 matching card or None if no card matches
+        """
+        cards = matching_cards(self.get_deck(), putdown_pile.top())
+        if not cards:
+            return None
+
+        card = next((card for card in cards if card.__class__ is not Pickup4Card), cards[0])
+        self.get_deck().remove(card)
+        return card
+
+
+@register("discard-highest")
+class DiscardHighestPlayer(ComputerPlayer):
+    """
+    A computer player which plays the matching card scoring the most points.
+    """
+    def pick_card(self, putdown_pile):
+        """
+        Selects a card to play from the players current deck.
+        :param putdown_pile: An instance of the Deck class
+        :return: The earliest added of the highest scoring matching cards or
+                 None if no card matches
+        """
+        cards = matching_cards(self.get_deck(), putdown_pile.top())
+        if not cards:
+            return None
+
+        card = max(cards, key=card_points)
+        self.get_deck().remove(card)
+        return card
+
+
+@register("random")
+class RandomPlayer(ComputerPlayer):
+    """
+    A computer player which plays a matching card at random, using the random
+    number generator of its game so seeded games can be replayed.
+    """
+    def __init__(self, name):
+        """
+        Construct a random player.
+        :param name (str): The name of the player
+        """
+        super().__init__(name)
+        self._random = random
+
+    def join(self, game):
+        """
+        Use the random number generator of the game.
+        :param game: The instance of the UnoGame class the player is seated in
+        """
+        self._random = game.get_random()
+
+    def pick_card(self, putdown_pile):
+        """
+        Selects a card to play from the players current deck.
+        :param putdown_pile: An instance of the Deck class
+        :return: A random matching card or None if no card matches
+        """
+        cards = matching_cards(self.get_deck(), putdown_pile.top())
+        if not cards:
+            return None
+
+        card = self._random.choice(cards)
+        self.get_deck().remove(card)
+        return card
+
+
+register("monte-carlo", MonteCarloPlayer)
+register("cached-monte-carlo", CachedMonteCarloPlayer)
+
+# strategies which search for every move, taking their whole budget each
+# time, so are only benchmarked when asked for by name
+SEARCH_STRATEGIES = ("monte-carlo", "cached-monte-carlo")
+
+
+class StrategyReport:
+    """
+    The latency and win rate of a strategy playing against the baseline.
+    """
+    def __init__(self, name, latencies, wins, games):
+        """
+        Construct a report for a strategy.
+
+        Parameters:
+            name (str): The name of the strategy.
+            latencies (list<float>): The seconds taken by every pick_card call.
+            wins (int): The amount of games won by the strategy.
+            games (int): The amount of games played.
+        """
+        self.name = name
+        self.latencies = sorted(latencies)
+        self.wins = wins
+        self.games = games
+
+    def percentile(self, percent):
+        """
+        (float) Returns the microseconds within which the given percent of
+        pick_card calls returned.
+        """
+        return percentile(self.latencies, percent) * 1e6
+
+    def win_rate(self):
+        """(float) Returns the fraction of games won by the strategy."""
+        if self.games == 0:
+            return 0.0
+        return self.wins / self.games
+
+    def __str__(self):
+        """
+        Return a one line summary of the report.
+        """
+        return "{:<20} p50 {:>10.1f}us  p99 {:>10.1f}us  calls {:>8}  win rate {:.1%}".format(
+            self.name, self.percentile(50), self.percentile(99), len(self.latencies), self.win_rate())
+
+
+def benchmark(name, games, player_count, hand_size=HAND_SIZE, max_turns=MAX_TURNS, seed=0):
+    """
+    Play a strategy in the first seat against the baseline in every other
+    seat, timing each card it picks.
+
+    Every strategy benchmarked with the same seed is dealt the same games.
+
+    Parameters:
+        name (str): The name of the strategy.
+        games (int): The amount of games to play.
+        player_count (int): The amount of players in each game.
+        hand_size (int): The amount of cards dealt to each player.
+        max_turns (int): The amount of turns after which a game is abandoned.
+        seed (int): The master seed the seed of every game is derived from.
+
+    Returns:
+        (StrategyReport): The latency and win rate of the strategy.
+    """
+    seating = [get_strategy(name)] + [get_strategy(BASELINE)] * (player_count - 1)
+    latencies = []
+    wins = 0
+
+    for index in range(games):
+        game = new_game(player_count, hand_size=hand_size, player_classes=seating,
+                        seed=derive_seed(seed, index))
+        player = game.players[0]
+        pick_card = player.pick_card
+
+        def timed_pick_card(putdown_pile):
+            start = time.perf_counter()
+            card = pick_card(putdown_pile)
+            latencies.append(time.perf_counter() - start)
+            return card
+
+        player.pick_card = timed_pick_card
+        if play_game(game, max_turns=max_turns).winner == 0:
+            wins += 1
+
+    return StrategyReport(name, latencies, wins, games)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the registered strategies.")
+    parser.add_argument("--games", type=int, default=200,
+                        help="amount of games to play with each strategy")
+    parser.add_argument("--players", type=int, default=4,
+                        help="amount of players in each game")
+    parser.add_argument("--hand-size", type=int, default=HAND_SIZE,
+                        help="amount of cards dealt to each player")
+    parser.add_argument("--max-turns", type=int, default=MAX_TURNS,
+                        help="amount of turns after which a game is abandoned")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="master seed of the games dealt to every strategy")
+    parser.add_argument("--strategies",
+                        default=",".join(name for name in STRATEGIES if name not in SEARCH_STRATEGIES),
+                        help="comma separated strategies to benchmark, every registered strategy "
+                             "except the search strategies ({}) by default".format(", ".join(SEARCH_STRATEGIES)))
+    args = parser.parse_args(argv)
+
+    for name in args.strategies.split(","):
+        print(benchmark(name.strip(), args.games, args.players, hand_size=args.hand_size,
+                        max_turns=args.max_turns, seed=args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,29 @@
 from test_util import OrderedTestCase, TestMaster
 from test_util import skipIfFailed
 
+import pickle
+import random
+import time
+import unittest
+from functools import partial
+
+import cache
+import instrument
+import render
+import scheduler
+import search
+import simulate
+import strategies
+import tournament
 import uno
+import uno_compact
 import uno_util
 
+try:
+    import vectorized
+except ImportError:  # NumPy is an optional dependency
+    vectorized = None
+
 CARD_CLASS = {
     '__init__': 3,
     'get_number': 1,
@@ -234,6 +254,62 @@ class TestCard(OrderedTestCase):
         self.assertEqual(str(pickup4), 'Pickup4Card(56, CardColour.black)', 'Pickup4Card.__str__ does not return correctly')
         self.assertEqual(repr(pickup4), 'Pickup4Card(56, CardColour.black)', 'Pickup4Card.__repr__ does not return correctly')
 
+    def test_card_slots(self):
+        for card_class in CARD_PICKUP_AMOUNTS:
+            card = card_class(1, uno_util.CardColour.red)
+            self.assertIs(hasattr(card, '__dict__'), False, f"{card_class.__name__} should not have a __dict__")
+
+    def test_card_interned(self):
+        first = uno_util.build_deck(uno_util.FULL_DECK)
+        second = uno_util.build_deck(uno_util.FULL_DECK)
+        for card, other in zip(first, second):
+            self.assertIs(card, other, "build_deck should share interned cards between decks")
+            self.assertIs(card.is_interned(), True, "build_deck should return interned cards")
+
+        self.assertIs(uno.intern_card(uno.Card, 3, uno_util.CardColour.red),
+                      uno.intern_card(uno.Card, 3, uno_util.CardColour.red),
+                      "intern_card should return the same instance for equal cards")
+        self.assertIs(uno.Card(3, uno_util.CardColour.red).is_interned(), False,
+                      "Directly constructed cards should not be interned")
+
+    @skipIfFailed(test_name='test_card_interned')
+    def test_card_interned_immutable(self):
+        card = uno.intern_card(uno.Card, 3, uno_util.CardColour.red)
+        with self.assertRaises(AttributeError):
+            card.set_number(4)
+        with self.assertRaises(AttributeError):
+            card.set_colour(uno_util.CardColour.blue)
+        self.assertEqual(card.get_number(), 3, "Interned cards should not be modified")
+
+        self.assertIs(card.with_number(4), uno.intern_card(uno.Card, 4, uno_util.CardColour.red),
+                      "Card.with_number should return an interned card")
+        self.assertIs(card.with_colour(uno_util.CardColour.blue), uno.intern_card(uno.Card, 3, uno_util.CardColour.blue),
+                      "Card.with_colour should return an interned card")
+
+    @skipIfFailed(test_name='test_card_interned')
+    def test_card_pickle(self):
+        card = uno.intern_card(uno.SkipCard, -1, uno_util.CardColour.green)
+        self.assertIs(pickle.loads(pickle.dumps(card)), card, "Unpickling an interned card should return the shared instance")
+
+        card = uno.Pickup2Card(5, uno_util.CardColour.blue)
+        copy = pickle.loads(pickle.dumps(card))
+        self.assertEqual(str(copy), str(card), "Pickling a card should preserve it")
+
+    @skipIfFailed(test_name='test_card_interned')
+    def test_card_match_table(self):
+        deck = uno_util.build_deck(uno_util.FULL_DECK)
+        for card in deck:
+            for other in deck:
+                self.assertIs(uno.matches(card, other), card.matches(other),
+                              f"uno.matches({card}, {other}) disagrees with Card.matches")
+
+        card = uno.Card(23, uno_util.CardColour.green)
+        self.assertIs(uno.matches(card, uno.Card(23, uno_util.CardColour.red)), True,
+                      "uno.matches should fall back to Card.matches for cards that are not interned")
+        self.assertIs(uno.matches(card, deck[0]), card.matches(deck[0]),
+                      "uno.matches should fall back to Card.matches for cards that are not interned")
+
+
 class TestGameplay(OrderedTestCase):
     def loadGame(self):
         deck = [
@@ -341,6 +417,128 @@ class TestGameplay(OrderedTestCase):
 
         self.assertEqual(self._game.get_turns().peak().get_deck().get_amount(), 4, "Playing a Pickup4Card should force the next player to pickup 4 cards")
 
+    def test_winner_tracking(self):
+        deck = uno.Deck([uno.Card(1, uno_util.CardColour.red), uno.Card(2, uno_util.CardColour.blue)])
+        players = [uno.ComputerPlayer("Anna Truffet"), uno.ComputerPlayer("Brae Webb")]
+        players[0].get_deck().add_card(uno.Card(2, uno_util.CardColour.green))
+        players[1].get_deck().add_cards([uno.Card(3, uno_util.CardColour.red),
+                                         uno.Card(5, uno_util.CardColour.red)])
+        game = uno_util.UnoGame(deck, players)
+
+        self.assertIs(game.is_over(), False, "Game should not be over while every player has cards")
+        self.assertEqual(game.get_hand_size(players[1]), 2, "UnoGame.get_hand_size returns incorrect value")
+
+        game.take_turn(players[1])
+        self.assertEqual(game.get_hand_size(players[1]), 3, "UnoGame should track cards picked up")
+        self.assertIs(game.is_over(), False, "Game should not be over while every player has cards")
+
+        game.take_turn(players[0])
+        self.assertEqual(game.get_hand_size(players[0]), 0, "UnoGame should track cards played")
+        self.assertIs(game.is_over(), True, "Game should be over once a player has no cards")
+        self.assertIs(game.winner, players[0], "UnoGame.winner should be the player who played their last card")
+
+    def test_deal_after_seating(self):
+        deck = uno.Deck(uno_util.build_deck(uno_util.FULL_DECK))
+        players = [uno.ComputerPlayer("Anna Truffet"), uno.ComputerPlayer("Brae Webb")]
+        game = uno_util.UnoGame(deck, players)
+        self.assertIs(game.is_over(), False, "Game should not be won by the empty hands it was built with")
+
+        deck.deal(players)
+        self.assertIs(game.is_over(), False, "Game should not be over once cards are dealt")
+        self.assertEqual(game.get_hand_size(players[0]), 7, "UnoGame should track cards dealt after seating")
+
+    def test_deck_hands(self):
+        for player_class in (DeckComputerPlayer, CompactComputerPlayer):
+            players = [player_class("Anna Truffet"), player_class("Brae Webb")]
+            players[0].get_deck().add_card(uno.Card(2, uno_util.CardColour.red))
+            players[1].get_deck().add_card(uno.Card(3, uno_util.CardColour.blue))
+            game = uno_util.UnoGame(uno.Deck([uno.Card(1, uno_util.CardColour.red)]), players)
+
+            game.select_card(players[0], players[0].get_deck().pick()[0])
+            self.assertIs(game.is_over(), True,
+                          "Game should track players holding a {}".format(player_class.deck_class.__name__))
+            self.assertIs(game.winner, players[0], "UnoGame.winner should be the player who played their last card")
+
+    def test_compact_hands(self):
+        cards = uno_util.build_deck(uno_util.FULL_DECK)
+        random.Random(5).shuffle(cards)
+        players = [CompactComputerPlayer("Anna Truffet"), CompactComputerPlayer("Brae Webb")]
+        pickup_pile = uno.Deck(cards)
+        pickup_pile.deal(players)
+        game = uno_util.UnoGame(pickup_pile, players, recycle=True)
+
+        result = simulate.play_game(game)
+        self.assertIs(game.is_over(), True, "A game of players holding a CompactDeck should finish")
+        self.assertIs(players[result.winner], game.winner, "UnoGame.winner should be the player who won")
+        self.assertEqual(game.winner.get_deck().get_amount(), 0, "UnoGame.winner should have played every card")
+
+    def test_recycle(self):
+        cards = uno_util.build_deck(uno_util.FULL_DECK)
+        players = [uno.ComputerPlayer("Anna Truffet"), uno.ComputerPlayer("Brae Webb")]
+        players[0].get_deck().add_cards(cards[:5])
+        game = uno_util.UnoGame(uno.Deck(cards[5:9]), players, recycle=True)
+        game.putdown_pile.add_cards(cards[9:13])
+        game.special_pile.add_cards(cards[13:15])
+        top = game.putdown_pile.top()
+
+        drawn = game.draw_cards(5)
+        self.assertEqual(len(drawn), 5, "UnoGame.draw_cards should recycle the discarded cards when the pickup pile runs out")
+        self.assertListEqual(drawn[:3], list(reversed(cards[5:8])),
+                             "Cards left in the pickup pile should be drawn before recycled cards")
+        self.assertListEqual(game.putdown_pile.get_cards(), [top], "Recycling should keep the top of the putdown pile")
+        self.assertEqual(game.special_pile.get_amount(), 0, "Recycling should empty the special pile")
+        self.assertEqual(game.pickup_pile.get_amount(), 3 + 4 + 2 - 5, "Recycling moves the wrong amount of cards")
+
+        drawn = game.draw_cards(10)
+        self.assertEqual(len(drawn), 4, "UnoGame.draw_cards should draw every available card")
+
+    def test_no_recycle(self):
+        self.loadGame()
+        with self.assertRaises(IndexError):
+            self._game.draw_cards(7)
+
+    def test_snapshot_restore(self):
+        game = simulate.new_game(3, seed=5)
+        snapshot = game.snapshot()
+        hands = [player.get_deck().get_cards() for player in game.players]
+        pickup = game.pickup_pile.get_cards()
+
+        simulate.play_game(game)
+        self.assertIs(game.is_over(), True, "Game should have been played to completion")
+
+        game.restore(snapshot)
+        self.assertListEqual([player.get_deck().get_cards() for player in game.players], hands,
+                             "UnoGame.restore should restore every hand")
+        self.assertListEqual(game.pickup_pile.get_cards(), pickup,
+                             "UnoGame.restore should restore the pickup pile")
+        self.assertIs(game.is_over(), False, "UnoGame.restore should restore the winner")
+        self.assertEqual(game.get_hand_size(game.players[0]), len(hands[0]),
+                         "UnoGame.restore should restore the tracked hand sizes")
+
+        first = simulate.play_game(game)
+        game.restore(snapshot)
+        self.assertEqual(simulate.play_game(game).turns, first.turns,
+                         "A restored game should be played identically")
+
+    def test_clone(self):
+        game = simulate.new_game(3, seed=9)
+        pickup = game.pickup_pile.get_cards()
+        hand = game.players[0].get_deck().get_cards()
+
+        clone = game.clone()
+        self.assertEqual([player.get_name() for player in clone.players],
+                         [player.get_name() for player in game.players],
+                         "UnoGame.clone should seat players with the same names")
+        self.assertIsNot(clone.players[0], game.players[0], "UnoGame.clone should construct new players")
+
+        clone_result = simulate.play_game(clone)
+        self.assertListEqual(game.pickup_pile.get_cards(), pickup,
+                             "Playing a clone should not change the original pickup pile")
+        self.assertListEqual(game.players[0].get_deck().get_cards(), hand,
+                             "Playing a clone should not change the original hands")
+        self.assertEqual(simulate.play_game(game).turns, clone_result.turns,
+                         "A clone should be played identically to the original game")
+
 
 class TestDeck(OrderedTestCase):
     def test_deck_constructor(self):
@@ -445,6 +643,66 @@ class TestDeck(OrderedTestCase):
 
         self.assertListEqual(deck.get_cards(), cards, "Deck.get_cards returns incorrectly")
 
+    def test_deck_version(self):
+        card = uno.Card(1, uno_util.CardColour.red)
+        for deck in (uno.Deck(), uno.Hand(), uno_compact.CompactDeck()):
+            versions = [deck.get_version()]
+            deck.add_card(card)
+            versions.append(deck.get_version())
+            deck.add_cards([card, card])
+            versions.append(deck.get_version())
+            deck.shuffle()
+            versions.append(deck.get_version())
+            deck.pick()
+            versions.append(deck.get_version())
+            deck.clear()
+            versions.append(deck.get_version())
+
+            name = deck.__class__.__name__
+            self.assertListEqual(versions, sorted(set(versions)),
+                                 "{}.get_version should increase with every change".format(name))
+            deck.top()
+            deck.get_amount()
+            self.assertEqual(deck.get_version(), versions[-1],
+                             "{}.get_version should not change when reading the deck".format(name))
+
+    def test_deck_pick_bulk(self):
+        cards = uno_util.build_deck(uno_util.FULL_DECK)
+        deck = uno.Deck(starting_cards=cards.copy())
+
+        self.assertListEqual(deck.pick(amount=0), [], "Deck.pick(0) should not pick any cards")
+        self.assertListEqual(deck.pick(amount=5), list(reversed(cards[-5:])),
+                             "Deck.pick should return the top cards, top card first")
+        self.assertListEqual(deck.get_cards(), cards[:-5], "Deck.pick should remove the picked cards")
+
+        with self.assertRaises(IndexError):
+            uno.Deck(starting_cards=cards[:2]).pick(amount=3)
+
+    def test_deck_deal(self):
+        cards = uno_util.build_deck(uno_util.FULL_DECK)
+        deck = uno.Deck(starting_cards=cards.copy())
+        players = [uno.ComputerPlayer("Anna Truffet"), uno.HumanPlayer("Brae Webb"), uno.ComputerPlayer("Wilson Kong")]
+
+        deck.deal(players, hand_size=7)
+
+        expected = uno.Deck(starting_cards=cards.copy())
+        for player in players:
+            self.assertListEqual(player.get_deck().get_cards(), expected.pick(7),
+                                 "Deck.deal should deal the same cards as picking for each player")
+        self.assertEqual(deck.get_amount(), len(cards) - 21, "Deck.deal removes the wrong amount of cards")
+
+    def test_deck_clear(self):
+        cards = [
+            uno.Card(1, uno_util.CardColour.blue),
+            uno.Card(3, uno_util.CardColour.red),
+            uno.Card(2, uno_util.CardColour.green),
+        ]
+        deck = uno.Deck(starting_cards=cards.copy())
+        self.assertListEqual(deck.clear(keep=1), cards[:2], "Deck.clear returns the wrong cards")
+        self.assertListEqual(deck.get_cards(), cards[2:], "Deck.clear should keep the top cards")
+        self.assertListEqual(deck.clear(), cards[2:], "Deck.clear returns the wrong cards")
+        self.assertEqual(deck.get_amount(), 0, "Deck.clear should remove every card")
+
     @skipIfFailed(test_name='test_deck_pick')
     def test_deck_top(self):
         cards = [
@@ -461,6 +719,14 @@ class TestDeck(OrderedTestCase):
         deck.pick()
 
 
+class DeckComputerPlayer(uno.ComputerPlayer):
+    deck_class = uno.Deck
+
+
+class CompactComputerPlayer(uno.ComputerPlayer):
+    deck_class = uno_compact.CompactDeck
+
+
 class TestPlayer(OrderedTestCase):
     def test_player_constructor(self):
         player = uno.Player("Test Player")
@@ -533,6 +799,554 @@ class TestPlayer(OrderedTestCase):
         picked = player.pick_card(deck)
         self.assertIsInstance(picked, uno.Card, "ComputerPlayer.pick_card should return an instance of Card (or a subclass) if it is possible to play a card")
 
+    def test_player_pick_card_plain_deck(self):
+        top = uno.Deck([uno.Card(3, uno_util.CardColour.red)])
+        for player_class in (DeckComputerPlayer, CompactComputerPlayer):
+            player = player_class("Test Player")
+            deck = player.get_deck()
+            deck.add_cards([uno.Card(6, uno_util.CardColour.yellow), uno.Card(3, uno_util.CardColour.blue),
+                            uno.Card(5, uno_util.CardColour.red)])
+
+            picked = player.pick_card(top)
+            self.assertEqual((picked.get_number(), picked.get_colour()), (3, uno_util.CardColour.blue),
+                             "ComputerPlayer.pick_card should play the first match of a plain deck")
+            self.assertEqual(deck.get_amount(), 2, "ComputerPlayer.pick_card should remove the card from the deck")
+
+
+class TestHand(OrderedTestCase):
+    def test_hand_is_deck(self):
+        player = uno.ComputerPlayer("Test Player")
+        self.assertIsInstance(player.get_deck(), uno.Hand, "Players should hold their cards in a Hand")
+        self.assertIsInstance(player.get_deck(), uno.Deck, "Hand should be a subclass of Deck")
+
+    def test_hand_find_match(self):
+        deck = uno_util.build_deck(uno_util.FULL_DECK)
+        rng = random.Random(2)
+        for _ in range(200):
+            cards = rng.sample(deck, rng.randint(0, 40))
+            top = rng.choice(deck)
+            expected = None
+            for card in cards:
+                if card.matches(top):
+                    expected = card
+                    break
+            self.assertIs(uno.Hand(cards).find_match(top), expected,
+                          "Hand.find_match should return the first matching card")
+
+    def test_hand_remove(self):
+        cards = uno_util.build_deck(uno_util.FULL_DECK)[:30]
+        hand = uno.Hand(cards)
+        expected = list(cards)
+
+        hand.remove(cards[3])
+        expected.remove(cards[3])
+        self.assertListEqual(hand.get_cards(), expected, "Hand.remove removes the wrong card")
+
+        self.assertIs(hand.pop(5), expected.pop(5), "Hand.pop returns the wrong card")
+        self.assertListEqual(hand.get_cards(), expected, "Hand.pop removes the wrong card")
+        self.assertEqual(hand.get_amount(), len(expected), "Hand.get_amount is incorrect after removing cards")
+
+        with self.assertRaises(ValueError):
+            uno.Hand().remove(cards[0])
+
+
+class TestSimulation(OrderedTestCase):
+    def test_new_game(self):
+        game = simulate.new_game(3)
+        self.assertEqual(len(game.players), 3, "simulate.new_game seats the wrong amount of players")
+        for player in game.players:
+            self.assertIsInstance(player, uno.ComputerPlayer, "simulate.new_game should seat computer players")
+            self.assertEqual(player.get_deck().get_amount(), simulate.HAND_SIZE,
+                             "simulate.new_game should deal a full hand to every player")
+
+    def test_play_game(self):
+        result = simulate.play_game(simulate.new_game(4))
+        self.assertGreater(result.turns, 0, "A simulated game should take at least one turn")
+        if result.is_finished():
+            self.assertIn(result.winner, range(4), "GameResult.winner should be a seat number")
+
+    def test_run_batch(self):
+        report = simulate.run_batch(5, 2)
+        self.assertEqual(report.get_games(), 5, "BatchReport should contain every simulated game")
+        self.assertEqual(len(report.get_turns()), 5, "BatchReport should record the turns of every game")
+
+    def test_seeded_games(self):
+        first = simulate.run_batch(4, 3, max_turns=500, seed=11)
+        second = simulate.run_batch(4, 3, max_turns=500, seed=11)
+        self.assertListEqual(first.get_turns(), second.get_turns(), "Batches with the same seed should be identical")
+
+        result = first.results[2]
+        replayed = simulate.replay_game(result.seed, 3, max_turns=500)
+        self.assertEqual((replayed.turns, replayed.winner), (result.turns, result.winner),
+                         "A game should be replayed identically from its seed")
+
+    def test_derive_seeds(self):
+        seeds = uno_util.derive_seeds(7, 50)
+        self.assertEqual(len(set(seeds)), 50, "derive_seeds should derive a different seed for every game")
+        self.assertEqual(seeds[12], uno_util.derive_seed(7, 12), "derive_seeds should agree with derive_seed")
+
+    def test_deck_random(self):
+        cards = uno_util.build_deck(uno_util.FULL_DECK)
+        first = uno.Deck(cards.copy())
+        first.set_random(random.Random(5))
+        first.shuffle()
+        second = uno.Deck(cards.copy())
+        second.set_random(random.Random(5))
+        second.shuffle()
+        self.assertListEqual(first.get_cards(), second.get_cards(), "Decks shuffled with equal generators should match")
+
+
+class TestTournament(OrderedTestCase):
+    def test_split_games(self):
+        self.assertListEqual(tournament.split_games(10, 4), [3, 3, 2, 2], "split_games should split games evenly")
+        self.assertListEqual(tournament.split_games(2, 4), [1, 1], "split_games should drop empty shards")
+
+    def test_play_shard(self):
+        seating = [uno.ComputerPlayer, uno.ComputerPlayer, uno.ComputerPlayer]
+        result = tournament.play_shard(seating, 1, 0, 5, max_turns=500)
+        self.assertEqual(result.games, 5, "play_shard should play every game in the shard")
+        self.assertEqual(sum(result.seat_wins) + result.abandoned, 5, "Every game should be won or abandoned")
+        self.assertEqual(result.class_wins(), {'ComputerPlayer': sum(result.seat_wins)},
+                         "TournamentResult.class_wins should aggregate the wins of every seat")
+
+    @skipIfFailed(test_name='test_play_shard')
+    def test_run_tournament(self):
+        seating = [uno.ComputerPlayer, uno.ComputerPlayer]
+        result = tournament.run_tournament(seating, 6, workers=2, max_turns=500, seed=3)
+        self.assertEqual(result.games, 6, "run_tournament should merge the games of every shard")
+        self.assertGreater(result.average_length(), 0, "run_tournament should record game lengths")
+
+        single = tournament.play_shard(seating, 3, 0, 6, max_turns=500)
+        self.assertListEqual(result.seat_wins, single.seat_wins,
+                             "A seeded tournament should not depend on how the games are sharded")
+        self.assertEqual(result.turns, single.turns,
+                         "A seeded tournament should not depend on how the games are sharded")
+
+
+class TestSearch(OrderedTestCase):
+    def loadGame(self, **kwargs):
+        seating = [partial(search.MonteCarloPlayer, **kwargs), uno.ComputerPlayer, uno.ComputerPlayer]
+        self._game = simulate.new_game(3, player_classes=seating, seed=11)
+        self._player = self._game.players[0]
+
+    def test_pick_card(self):
+        self.loadGame(budget=1000, rollouts=20, rng=1)
+        hand = self._player.get_deck().get_cards()
+        top = self._game.putdown_pile.top()
+
+        card = self._player.pick_card(self._game.putdown_pile)
+        if card is None:
+            self.assertFalse(any(uno.matches(other, top) for other in hand),
+                             "MonteCarloPlayer.pick_card should play when a card matches")
+        else:
+            self.assertTrue(uno.matches(card, top), "MonteCarloPlayer.pick_card should play a matching card")
+            self.assertEqual(self._player.get_deck().get_amount(), len(hand) - 1,
+                             "MonteCarloPlayer.pick_card should remove the card from the hand")
+
+    def test_no_budget(self):
+        self.loadGame(budget=0)
+        hand = self._player.get_deck().copy()
+        expected = hand.find_match(self._game.putdown_pile.top())
+        self.assertIs(self._player.pick_card(self._game.putdown_pile), expected,
+                      "MonteCarloPlayer without a budget should play the first matching card")
+
+    def test_budget(self):
+        self.loadGame(budget=5)
+        slowest = 0
+        while not self._game.is_over():
+            player = self._game.next_player()
+            start = time.perf_counter()
+            self._game.take_turn(player)
+            if player is self._player:
+                slowest = max(slowest, time.perf_counter() - start)
+        # without a budget the search would not stop, so the bound is loose
+        # enough not to depend on the speed of the machine
+        self.assertLess(slowest, 0.5, "MonteCarloPlayer.pick_card should stop searching once its budget runs out")
+
+    def test_slow_setup(self):
+        self.loadGame(budget=50, rng=1)
+        self._player._setup = 1.0
+        simulate.play_game(self._game)
+        rollouts = sum(visits for scores in self._player._positions.values() for visits, _ in scores.values())
+        self.assertGreater(rollouts, 0, "MonteCarloPlayer should search again after a slow playout set up")
+
+        self._player.join(self._game)
+        self.assertEqual(self._player._setup, 0.0, "MonteCarloPlayer.join should forget how long set ups took")
+
+    def test_clone(self):
+        self.loadGame(budget=7, rollouts=3, rng=1)
+        clone = self._game.clone().players[0]
+        self.assertIsInstance(clone, search.MonteCarloPlayer, "UnoGame.clone should seat players of the same class")
+        self.assertEqual(clone.get_budget(), 7, "MonteCarloPlayer.clone should keep the budget")
+        self.assertIsNot(clone, self._player, "MonteCarloPlayer.clone should construct a new player")
+
+    def test_parse_players(self):
+        self.assertListEqual(tournament.parse_players("MonteCarloPlayer, ComputerPlayer"),
+                             [search.MonteCarloPlayer, uno.ComputerPlayer],
+                             "parse_players should find players in the search module")
+
+
+class CachedComputerPlayer(cache.CachedPlayer, uno.ComputerPlayer):
+    cache = cache.DecisionCache(maxsize=2)
+
+
+class TestCache(OrderedTestCase):
+    def test_decision_cache(self):
+        decisions = cache.DecisionCache(maxsize=2)
+        self.assertIs(decisions.get("a"), cache.MISSING, "DecisionCache.get should miss an empty cache")
+        decisions.put("a", None)
+        decisions.put("b", 2)
+        self.assertIsNone(decisions.get("a"), "DecisionCache should cache None decisions")
+
+        decisions.put("c", 3)
+        self.assertIs(decisions.get("b"), cache.MISSING, "DecisionCache should evict the least recently used decision")
+        self.assertEqual(decisions.get("c"), 3, "DecisionCache.get returns incorrect value")
+        self.assertEqual(len(decisions), 2, "DecisionCache should hold at most maxsize decisions")
+        self.assertEqual((decisions.hits, decisions.misses, decisions.evictions), (2, 2, 1),
+                         "DecisionCache counters are incorrect")
+
+    def test_cached_player(self):
+        CachedComputerPlayer.cache.clear()
+        red = uno.intern_card(uno.Card, 1, uno_util.CardColour.red)
+        blue = uno.intern_card(uno.Card, 1, uno_util.CardColour.blue)
+        putdown_pile = uno.Deck([uno.intern_card(uno.Card, 5, uno_util.CardColour.red)])
+
+        first = CachedComputerPlayer("Anna Truffet")
+        first.get_deck().add_cards([blue, red])
+        self.assertIs(first.pick_card(putdown_pile), red, "CachedPlayer should pick the card of the cached player")
+
+        second = CachedComputerPlayer("Brae Webb")
+        second.get_deck().add_cards([red, blue])
+        self.assertIs(second.pick_card(putdown_pile), red, "CachedPlayer should pick the cached card")
+        self.assertListEqual(second.get_deck().get_cards(), [blue], "CachedPlayer should remove the cached card")
+        self.assertEqual(CachedComputerPlayer.cache.hits, 1, "CachedPlayer should cache hands in any order")
+
+    def test_uninterned(self):
+        CachedComputerPlayer.cache.clear()
+        player = CachedComputerPlayer("Anna Truffet")
+        player.get_deck().add_card(uno.Card(1, uno_util.CardColour.red))
+        player.pick_card(uno.Deck([uno.Card(1, uno_util.CardColour.red)]))
+        self.assertEqual(len(CachedComputerPlayer.cache), 0, "CachedPlayer should not cache hands of uninterned cards")
+
+
+class TestStrategies(OrderedTestCase):
+    def loadHand(self, cards):
+        self._top = uno.Deck([uno.intern_card(uno.Card, 5, uno_util.CardColour.red)])
+        self._cards = [uno.intern_card(kind, number, colour) for kind, number, colour in cards]
+
+    def test_registry(self):
+        self.assertIs(strategies.get_strategy("first-match"), uno.ComputerPlayer,
+                      "first-match should be the ComputerPlayer strategy")
+        for name in ("hold-wilds", "discard-highest", "random"):
+            self.assertTrue(issubclass(strategies.get_strategy(name), uno.Player),
+                            "{} should be a registered strategy".format(name))
+        with self.assertRaises(ValueError):
+            strategies.get_strategy("cheat")
+        with self.assertRaises(ValueError):
+            strategies.register("random", uno.ComputerPlayer)
+        self.assertListEqual(tournament.parse_players("hold-wilds,ComputerPlayer"),
+                             [strategies.HoldWildsPlayer, uno.ComputerPlayer],
+                             "parse_players should find registered strategies")
+
+    def test_hold_wilds(self):
+        self.loadHand([(uno.Pickup4Card, -1, uno_util.CardColour.black),
+                       (uno.Card, 2, uno_util.CardColour.red)])
+        player = strategies.HoldWildsPlayer("Anna Truffet")
+        player.get_deck().add_cards(self._cards)
+        self.assertIs(player.pick_card(self._top), self._cards[1], "hold-wilds should play other matches first")
+        self.assertIs(player.pick_card(self._top), self._cards[0], "hold-wilds should play a wild without other matches")
+        self.assertIsNone(player.pick_card(self._top), "pick_card should return None without a match")
+
+    def test_discard_highest(self):
+        self.loadHand([(uno.Card, 2, uno_util.CardColour.red),
+                       (uno.SkipCard, -1, uno_util.CardColour.red),
+                       (uno.Card, 9, uno_util.CardColour.blue),
+                       (uno.Card, 7, uno_util.CardColour.red)])
+        player = strategies.DiscardHighestPlayer("Anna Truffet")
+        player.get_deck().add_cards(self._cards)
+        self.assertIs(player.pick_card(self._top), self._cards[1], "discard-highest should play action cards first")
+        self.assertIs(player.pick_card(self._top), self._cards[3], "discard-highest should play the highest match")
+
+    def test_seeded_strategies(self):
+        seating = strategies.parse_strategies("random,hold-wilds,discard-highest")
+        first = simulate.run_batch(5, 3, max_turns=500, seed=4, player_classes=seating)
+        second = simulate.run_batch(5, 3, max_turns=500, seed=4, player_classes=seating)
+        self.assertListEqual(first.get_turns(), second.get_turns(),
+                             "Seeded games between strategies should be replayed identically")
+
+    def test_benchmark(self):
+        report = strategies.benchmark("first-match", 3, 3, max_turns=200, seed=1)
+        self.assertEqual(report.games, 3, "benchmark should play every game")
+        self.assertGreater(len(report.latencies), 0, "benchmark should time every pick_card call")
+        self.assertLessEqual(report.percentile(50), report.percentile(99),
+                             "StrategyReport.percentile should increase with the percent")
+
+
+@unittest.skipIf(vectorized is None, "NumPy is not installed")
+class TestVectorized(OrderedTestCase):
+    def test_card_kinds(self):
+        kinds = vectorized.CardKinds()
+        deck = uno_util.build_deck(uno_util.FULL_DECK)
+        self.assertEqual(len(kinds.deck_kinds), len(deck), "CardKinds should record every card in the deck")
+        for card in deck:
+            for top in kinds.cards:
+                self.assertEqual(bool(kinds.match[kinds.index(card), kinds.index(top)]), card.matches(top),
+                                 f"CardKinds.match disagrees with {card}.matches({top})")
+
+    @skipIfFailed(test_name='test_card_kinds')
+    def test_matches_engine(self):
+        """Lockstep games play out exactly like UnoGame until a pile is recycled"""
+        kinds = vectorized.CardKinds()
+        decks, expected = [], []
+        for seed in range(40):
+            cards = uno_util.build_deck(uno_util.FULL_DECK)
+            random.Random(seed).shuffle(cards)
+            decks.append([kinds.index(card) for card in cards])
+
+            pickup_pile = uno.Deck(cards)
+            players = [uno.ComputerPlayer(str(seat)) for seat in range(3)]
+            pickup_pile.deal(players)
+            try:
+                result = simulate.play_game(uno_util.UnoGame(pickup_pile, players), max_turns=1000)
+                expected.append((result.turns, -1 if result.winner is None else result.winner))
+            except IndexError:
+                # the game needed its pickup pile recycled
+                expected.append(None)
+
+        batch = vectorized.LockstepSimulator(vectorized.np.array(decks), 3, kinds, max_turns=1000)
+        turns, winners = batch.run()
+
+        compared = 0
+        for game, result in enumerate(expected):
+            if result is None or batch.recycles[game]:
+                continue
+            compared += 1
+            self.assertEqual((int(turns[game]), int(winners[game])), result,
+                             f"Lockstep game {game} played differently to UnoGame")
+        self.assertGreater(compared, 0, "No games were compared")
+
+    def test_simulate(self):
+        turns, winners = vectorized.simulate(50, 4, max_turns=500, batch_size=16, seed=3)
+        self.assertEqual(len(turns), 50, "vectorized.simulate should play every game")
+        self.assertIs(bool(((winners >= -1) & (winners < 4)).all()), True, "Winners should be seats or -1")
+
+        again, _ = vectorized.simulate(50, 4, max_turns=500, batch_size=16, seed=3)
+        self.assertListEqual(turns.tolist(), again.tolist(), "Seeded simulations should be reproducible")
+
+
+class TestCompact(OrderedTestCase):
+    def test_encode_round_trip(self):
+        for card in uno_util.build_deck(uno_util.FULL_DECK):
+            code = uno_compact.encode(card)
+            self.assertIn(code, range(256), "Encoded cards should fit in a byte")
+
+            decoded = uno_compact.decode(code)
+            self.assertIs(decoded.__class__, card.__class__, "Decoding should preserve the card type")
+            self.assertEqual(decoded.get_number(), card.get_number(), "Decoding should preserve the card number")
+            self.assertEqual(decoded.get_colour(), card.get_colour(), "Decoding should preserve the card colour")
+
+    def test_encode_invalid(self):
+        with self.assertRaises(ValueError):
+            uno_compact.encode(uno.Card(15, uno_util.CardColour.red))
+        with self.assertRaises(ValueError):
+            uno_compact.encode(uno.SkipCard(3, uno_util.CardColour.red))
+
+    def test_compact_deck(self):
+        cards = uno_util.build_deck(uno_util.FULL_DECK)
+        deck = uno_compact.CompactDeck(cards)
+
+        self.assertEqual(deck.get_amount(), len(cards), "CompactDeck should hold every starting card")
+        self.assertEqual(len(deck.get_codes()), len(cards), "CompactDeck should store one byte per card")
+        self.assertEqual(str(deck.top()), str(cards[-1]), "CompactDeck.top returns the wrong card")
+
+        picked = deck.pick(3)
+        self.assertListEqual([str(card) for card in picked], [str(card) for card in reversed(cards[-3:])],
+                             "CompactDeck.pick returns the wrong cards")
+
+        regular = deck.to_deck()
+        self.assertListEqual([str(card) for card in regular.get_cards()], [str(card) for card in cards[:-3]],
+                             "CompactDeck.to_deck should keep the order of the cards")
+
+
+class TestRender(OrderedTestCase):
+    def test_card_face(self):
+        red = uno_util.CardColour.red
+        face = render.card_face(uno.Card(3, red))
+        self.assertEqual(face.background, red.value, "Cards should be drawn in their colour")
+        self.assertEqual(face.text, "3", "Number cards should show their number")
+
+        skip = render.card_face(uno.SkipCard(0, red))
+        self.assertEqual(skip.icon, "skip", "Skip cards should show the skip icon")
+        self.assertEqual(skip.text, "", "Skip cards should not show any text")
+
+        pickup = render.card_face(uno.Pickup2Card(0, red))
+        self.assertEqual(pickup.text, "+2", "Pickup cards should show the amount to pickup")
+
+        interned = uno.intern_card(uno.Card, 5, red)
+        self.assertIs(render.card_face(interned), render.card_face(interned),
+                      "Faces of interned cards should be shared")
+
+    def test_diff(self):
+        previous = {("a", 0): 1, ("a", 1): 2}
+        current = {("a", 1): 3, ("a", 2): 4}
+        self.assertListEqual(render.diff(previous, current), [
+            render.DrawOp(render.DELETE, "a", 0, None),
+            render.DrawOp(render.UPDATE, "a", 1, 3),
+            render.DrawOp(render.CREATE, "a", 2, 4),
+        ], "diff returns the wrong operations")
+        self.assertListEqual(render.diff(current, current), [], "Equal frames should not need any operations")
+
+    def test_board_model(self):
+        game = simulate.new_game(3, seed=7)
+        model = render.BoardModel()
+        backend = render.RecordingBackend()
+
+        backend.apply(model.render(game))
+        self.assertEqual(backend.frame[(0, render.NAME)], game.players[0].get_name(),
+                         "The first frame should draw every seat")
+        self.assertEqual(backend.frame[(render.PICKUP, render.SIZE)], game.pickup_pile.get_amount(),
+                         "The first frame should draw every pile")
+        self.assertListEqual(model.render(game), [], "An unchanged game should not need any operations")
+
+        turns = 0
+        while not game.is_over() and turns < 100:
+            game.take_turn(game.next_player())
+            ops = model.render(game)
+            self.assertLess(len(ops), 50, "A turn should only change a few parts of the board")
+            backend.apply(ops)
+            turns += 1
+
+        self.assertDictEqual(backend.frame, model.frame(),
+                             "Applying every operation should build the last frame")
+
+
+class ProfiledCanvas:
+    def config(self, **kwargs):
+        return kwargs
+
+    def draw(self):
+        self.config(width=1)
+        self.config(height=1)
+
+
+class TestInstrument(OrderedTestCase):
+    def test_frames(self):
+        profiler = instrument.FrameProfiler()
+        profiler.frame(ProfiledCanvas, "draw")
+        profiler.count(ProfiledCanvas, "config")
+        frames = []
+        profiler.set_listener(frames.append)
+
+        canvas = ProfiledCanvas()
+        profiler.name(canvas, "deck")
+        try:
+            canvas.draw()
+            canvas.draw()
+        finally:
+            profiler.uninstall()
+
+        self.assertEqual(profiler.frames, 2, "Every call of a frame method should end a frame")
+        self.assertEqual(len(frames), 2, "The listener should be called after every frame")
+        self.assertDictEqual(profiler.last_frame()["calls"], {"config": 2},
+                             "Calls should be counted in the frame they were made in")
+
+        report = profiler.report()
+        self.assertDictEqual(report["objects"], {"deck": {"config": 4}}, "Calls should be counted by object name")
+        self.assertEqual(report["calls_per_frame"]["config"], 2, "Calls per frame is wrong")
+        self.assertEqual(report["timings"]["ProfiledCanvas.draw"]["calls"], 2, "Frames should be timed")
+
+    def test_bounded_timings(self):
+        profiler = instrument.FrameProfiler()
+        for _ in range(instrument.TIMING_LOG + 10):
+            profiler.end_frame("frame", 0.001)
+
+        self.assertEqual(len(profiler.timings["frame"]), instrument.TIMING_LOG,
+                         "Only the latest timings should be kept")
+        self.assertEqual(profiler.report()["timings"]["frame"]["calls"], instrument.TIMING_LOG + 10,
+                         "The report should count every call")
+
+    def test_uninstall(self):
+        draw = ProfiledCanvas.__dict__["draw"]
+        profiler = instrument.FrameProfiler()
+        profiler.time(ProfiledCanvas, "draw")
+        profiler.count(ProfiledCanvas, "config")
+        profiler.uninstall()
+
+        ProfiledCanvas().draw()
+        self.assertEqual(len(profiler.timings["ProfiledCanvas.draw"]), 0, "Uninstalled methods should not be timed")
+        self.assertEqual(profiler.calls, {}, "Uninstalled methods should not be counted")
+        self.assertIs(ProfiledCanvas.__dict__["draw"], draw, "Uninstall should restore the methods")
+
+
+class ManualMaster:
+    """A stand in for a Tk widget whose after callbacks are run by hand."""
+    def __init__(self):
+        self.now = 0.0
+        self.callbacks = {}
+
+    def after(self, delay, callback):
+        handle = len(self.callbacks) + 1
+        self.callbacks[handle] = (self.now + delay / 1000, callback)
+        return handle
+
+    def after_cancel(self, handle):
+        self.callbacks.pop(handle, None)
+
+    def run(self):
+        while self.callbacks:
+            handle = min(self.callbacks, key=lambda handle: self.callbacks[handle][0])
+            when, callback = self.callbacks.pop(handle)
+            self.now = max(self.now, when)
+            callback()
+
+
+class TestScheduler(OrderedTestCase):
+    def loadScheduler(self):
+        self.master = ManualMaster()
+        self.drawn = []
+        return scheduler.FrameScheduler(self.master, lambda: self.drawn.append(self.master.now),
+                                        clock=lambda: self.master.now)
+
+    def test_coalesce(self):
+        frames = self.loadScheduler()
+        frames.invalidate()
+        frames.invalidate()
+        frames.invalidate()
+        self.master.run()
+
+        self.assertEqual(frames.renders, 1, "Invalidating many times should only redraw once")
+        self.assertEqual(frames.ticks, 1, "An idle scheduler should stop ticking")
+
+    def test_tasks(self):
+        frames = self.loadScheduler()
+        ran = []
+        frames.call_later(100, lambda: (ran.append(("late", self.master.now)), frames.invalidate()))
+        frames.call_later(0, lambda: (ran.append(("soon", self.master.now)), frames.invalidate()))
+        cancelled = frames.call_later(50, lambda: ran.append(("cancelled", self.master.now)))
+        frames.cancel(cancelled)
+        self.master.run()
+
+        self.assertListEqual([name for name, _ in ran], ["soon", "late"], "Tasks should run in the order they are due")
+        self.assertGreaterEqual(ran[1][1], 0.1, "Tasks should not run before their delay")
+        self.assertEqual(frames.renders, 2, "Every tick with a change should redraw once")
+        self.assertEqual(frames.pending(), 0, "Every task should have run")
+
+    def test_frame_rate(self):
+        frames = self.loadScheduler()
+
+        def animate(steps):
+            frames.invalidate()
+            if steps > 1:
+                frames.call_later(0, lambda: animate(steps - 1))
+
+        frames.call_later(0, lambda: animate(10))
+        self.master.run()
+
+        self.assertEqual(frames.renders, 10, "An animation should redraw once per tick")
+        gaps = [after - before for before, after in zip(self.drawn, self.drawn[1:])]
+        self.assertGreaterEqual(min(gaps), scheduler.FRAME_TIME / 1000 - 1e-9,
+                                "Ticks should be at least a frame apart")
+
 
 def main():
     test_cases = [
@@ -541,6 +1355,17 @@ def main():
         TestDeck,
         TestPlayer,
         TestGameplay,
+        TestHand,
+        TestSimulation,
+        TestTournament,
+        TestSearch,
+        TestCache,
+        TestStrategies,
+        TestVectorized,
+        TestCompact,
+        TestRender,
+        TestInstrument,
+        TestScheduler,
     ]
 
     master = TestMaster()
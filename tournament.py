@@ -0,0 +1,257 @@
+"""
+Tournaments of headless Uno games spread across every core of a machine.
+
+Run a tournament from the command line with:
+
+    python -m tournament --games 100000 --players ComputerPlayer,ComputerPlayer,ComputerPlayer
+"""
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import search
+import strategies
+import uno
+from simulate import HAND_SIZE, MAX_TURNS, new_game, play_game
+from uno_util import derive_seed
+
+SHARDS_PER_WORKER = 4
+
+
+class TournamentResult:
+    """
+    The aggregated outcome of the games in a tournament, or a shard of it.
+    """
+    def __init__(self, player_classes, seed=None):
+        """
+        Construct an empty result for a seating of players.
+
+        Parameters:
+            player_classes (list<type>): The Player subclass in each seat.
+            seed (int): The master seed the game seeds were derived from.
+        """
+        self.player_classes = list(player_classes)
+        self.seed = seed
+        self.seat_wins = [0] * len(player_classes)
+        self.games = 0
+        self.abandoned = 0
+        self.turns = 0
+
+    def record(self, result):
+        """
+        Add the result of a game to the tournament.
+
+        Parameters:
+            result (GameResult): The outcome of the game.
+        """
+        self.games += 1
+        self.turns += result.turns
+        if result.is_finished():
+            self.seat_wins[result.winner] += 1
+        else:
+            self.abandoned += 1
+
+    def merge(self, other):
+        """
+        Add the games of another result with the same seating to this result.
+
+        Parameters:
+            other (TournamentResult): The result to merge in.
+        """
+        if other.player_classes != self.player_classes:
+            raise ValueError("Can not merge results of tournaments with different seating")
+
+        for seat, wins in enumerate(other.seat_wins):
+            self.seat_wins[seat] += wins
+        self.games += other.games
+        self.abandoned += other.abandoned
+        self.turns += other.turns
+
+    def class_wins(self):
+        """
+        (dict<str, int>) Returns the amount of wins of each player class.
+        """
+        wins = {}
+        for player_class, seat_wins in zip(self.player_classes, self.seat_wins):
+            name = player_class.__name__
+            wins[name] = wins.get(name, 0) + seat_wins
+        return wins
+
+    def class_win_rates(self):
+        """
+        (dict<str, float>) Returns the fraction of seat-games each player class won.
+        """
+        seats = {}
+        for player_class in self.player_classes:
+            name = player_class.__name__
+            seats[name] = seats.get(name, 0) + 1
+
+        return {name: wins / (seats[name] * self.games) if self.games else 0.0
+                for name, wins in self.class_wins().items()}
+
+    def average_length(self):
+        """
+        (float) Returns the mean amount of turns per game.
+        """
+        if not self.games:
+            return 0.0
+        return self.turns / self.games
+
+    def __str__(self):
+        """
+        Return a human readable summary of the tournament.
+        """
+        lines = [
+            "seed:         {}".format(self.seed),
+            "games:        {}".format(self.games),
+            "abandoned:    {}".format(self.abandoned),
+            "turns/game:   {:.1f}".format(self.average_length()),
+        ]
+        for seat, (player_class, wins) in enumerate(zip(self.player_classes, self.seat_wins)):
+            lines.append("seat {} {:<16} {} wins".format(seat, player_class.__name__, wins))
+
+        win_rates = self.class_win_rates()
+        for name, wins in self.class_wins().items():
+            lines.append("{:<23} {} wins ({:.1%} per seat)".format(name, wins, win_rates[name]))
+        return "\n".join(lines)
+
+
+def play_shard(player_classes, seed, start, games, hand_size=HAND_SIZE,
+               max_turns=MAX_TURNS):
+    """
+    Play a shard of a tournament, building every deck and player in this process.
+
+    The seed of each game is derived from the tournament seed and the game's
+    position in the tournament, so results do not depend on how the games
+    are sharded.
+
+    Parameters:
+        player_classes (list<type>): The Player subclass in each seat.
+        seed (int): The master seed of the tournament.
+        start (int): The position of the shard's first game in the tournament.
+        games (int): The amount of games in the shard.
+        hand_size (int): The amount of cards dealt to each player.
+        max_turns (int): The amount of turns after which a game is abandoned.
+
+    Returns:
+        (TournamentResult): The outcome of the games in the shard.
+    """
+    result = TournamentResult(player_classes, seed=seed)
+    for index in range(start, start + games):
+        game_seed = derive_seed(seed, index)
+        game = new_game(len(player_classes), hand_size=hand_size,
+                        player_classes=player_classes, seed=game_seed)
+        result.record(play_game(game, max_turns=max_turns, seed=game_seed))
+    return result
+
+
+def split_games(games, shards):
+    """
+    Split an amount of games as evenly as possible into shards.
+
+    Parameters:
+        games (int): The amount of games to split.
+        shards (int): The amount of shards to split the games into.
+
+    Returns:
+        (list<int>): The amount of games in each non-empty shard.
+    """
+    size, extra = divmod(games, shards)
+    sizes = [size + 1] * extra + [size] * (shards - extra)
+    return [size for size in sizes if size]
+
+
+def run_tournament(player_classes, games, workers=None, hand_size=HAND_SIZE,
+                   max_turns=MAX_TURNS, seed=None):
+    """
+    Play a tournament across a pool of worker processes.
+
+    Parameters:
+        player_classes (list<type>): The Player subclass in each seat.
+        games (int): The amount of games to play.
+        workers (int): The amount of worker processes, every core if None.
+        hand_size (int): The amount of cards dealt to each player.
+        max_turns (int): The amount of turns after which a game is abandoned.
+        seed (int): The master seed of the tournament, chosen at random if None.
+
+    Returns:
+        (TournamentResult): The outcome of every game in the tournament.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if seed is None:
+        seed = random.getrandbits(32)
+
+    result = TournamentResult(player_classes, seed=seed)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        start = 0
+        for shard in split_games(games, workers * SHARDS_PER_WORKER):
+            futures.append(executor.submit(play_shard, player_classes, seed, start, shard,
+                                           hand_size=hand_size, max_turns=max_turns))
+            start += shard
+
+        for future in futures:
+            result.merge(future.result())
+    return result
+
+
+def parse_players(names):
+    """
+    Look up the Player subclasses for a comma separated list of class names.
+
+    Parameters:
+        names (str): Names of registered strategies, such as "hold-wilds", or
+                     of classes in the uno or search modules, such as
+                     "ComputerPlayer" or "MonteCarloPlayer".
+
+    Returns:
+        (list<type>): The Player subclass for each seat.
+    """
+    player_classes = []
+    for name in names.split(","):
+        name = name.strip()
+        player_class = strategies.STRATEGIES.get(name)
+        if player_class is None:
+            player_class = getattr(uno, name, getattr(search, name, None))
+        if not isinstance(player_class, type) or not issubclass(player_class, uno.Player):
+            raise ValueError("{} is not a player class".format(name))
+        player_classes.append(player_class)
+    return player_classes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play a tournament of headless games of Uno.")
+    parser.add_argument("--games", type=int, default=10000,
+                        help="amount of games to play")
+    parser.add_argument("--players", default="ComputerPlayer,ComputerPlayer,ComputerPlayer,ComputerPlayer",
+                        help="comma separated player class of each seat")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="amount of worker processes, defaults to every core")
+    parser.add_argument("--hand-size", type=int, default=HAND_SIZE,
+                        help="amount of cards dealt to each player")
+    parser.add_argument("--max-turns", type=int, default=MAX_TURNS,
+                        help="amount of turns after which a game is abandoned")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="master seed of the tournament, chosen at random if omitted")
+    args = parser.parse_args(argv)
+
+    try:
+        player_classes = parse_players(args.players)
+    except ValueError as error:
+        parser.error(str(error))
+
+    start = time.perf_counter()
+    result = run_tournament(player_classes, args.games, workers=args.workers,
+                            hand_size=args.hand_size, max_turns=args.max_turns,
+                            seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(result)
+    print("elapsed:      {:.3f}s ({:.1f} games/sec)".format(elapsed, result.games / elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,12 @@ import random
 class Card:
     """
     The basic number, colour and methods of a UNO card
+
+    Cards constructed directly are mutable. Cards returned by intern_card are
+    shared between every deck and game, so they can not be modified.
     """
+    __slots__ = ('_number', '_colour', '_index', '_matches')
+
     def __init__(self, number, colour):
         """
         Construct a card based on its number and colour.
@@ -13,6 +18,8 @@ class Card:
         """
         self._number = number
         self._colour = colour
+        self._index = None
+        self._matches = None
 
     def __str__(self):
         """
@@ -23,6 +30,22 @@ class Card:
 
     __repr__ = __str__
 
+    def __reduce__(self):
+        """
+        Return the information required to pickle the card, keeping interned cards shared.
+        :return (tuple): A callable and the arguments to recreate the card
+        """
+        if self._index is not None:
+            return intern_card, (self.__class__, self._number, self._colour)
+        return self.__class__, (self._number, self._colour)
+
+    def is_interned(self):
+        """
+        Return True if the card is a shared instance from intern_card.
+        :return (bool): True if the card is interned and therefore immutable
+        """
+        return self._index is not None
+
     def get_number(self):
         """
         Return the number of the card.
@@ -42,6 +65,7 @@ class Card:
         Set the number of the card.
         :param number: (int) The number of the card
         """
+        self._check_mutable()
         self._number = number
 
     def set_colour(self, colour):
@@ -49,8 +73,33 @@ class Card:
         Set the colour of the card.
         :param colour: (str) The colour of the card
         """
+        self._check_mutable()
         self._colour = colour
 
+    def with_number(self, number):
+        """
+        Return the interned card of the same kind and colour with a different number.
+        :param number: (int) The number of the card
+        :return (Card): The interned card with the given number
+        """
+        return intern_card(self.__class__, number, self._colour)
+
+    def with_colour(self, colour):
+        """
+        Return the interned card of the same kind and number with a different colour.
+        :param colour: (str) The colour of the card
+        :return (Card): The interned card with the given colour
+        """
+        return intern_card(self.__class__, self._number, colour)
+
+    def _check_mutable(self):
+        """
+        Raise an AttributeError if the card is interned.
+        """
+        if self._index is not None:
+            raise AttributeError("{} is interned and can not be modified, "
+                                 "use with_number or with_colour instead".format(self))
+
     def get_pickup_amount(self):
         """
         Return the amount of cards the next player should pick up.
@@ -79,6 +128,8 @@ class SkipCard(Card):
     """
     A card which skips the turn of the next player.
     """
+    __slots__ = ()
+
     def __str__(self):
         """
         Return the string representation of the skip card.
@@ -109,6 +160,8 @@ class ReverseCard(Card):
     """
     A card which reverses the order of turns.
     """
+    __slots__ = ()
+
     def __str__(self):
         """
         Return the string representation of the reverse card.
@@ -139,6 +192,8 @@ class Pickup2Card(Card):
     """
     A card which makes the next player pick up two cards
     """
+    __slots__ = ()
+
     def __str__(self):
         """
         Return the string representation of the Pickup2 card.
@@ -170,7 +225,7 @@ class Pickup2Card(Card):
         :param game: An instance of the UnoGame class from uno_util.py
         """
         next_player_deck = game.get_turns().peak().get_deck()  # Get the next player's deck of cards.
-        pickup_cards = game.pickup_pile.pick(self.get_pickup_amount())  # Get the cards that need to be picked up.
+        pickup_cards = game.draw_cards(self.get_pickup_amount())  # Get the cards that need to be picked up.
         next_player_deck.add_cards(pickup_cards)  # Add the cards to the next player's deck of cards
 
 
@@ -178,6 +233,8 @@ class Pickup4Card(Card):
     """
     A card which makes the next player pick up four cards
     """
+    __slots__ = ()
+
     def __str__(self):
         """
         Return the string representation of the Pickup4 card.
@@ -209,10 +266,66 @@ class Pickup4Card(Card):
         :param game: An instance of the UnoGame class from uno_util.py
         """
         next_player_deck = game.get_turns().peak().get_deck()  # Get the next player's deck of cards.
-        pickup_cards = game.pickup_pile.pick(self.get_pickup_amount())  # Get the cards that need to be picked up.
+        pickup_cards = game.draw_cards(self.get_pickup_amount())  # Get the cards that need to be picked up.
         next_player_deck.add_cards(pickup_cards)  # Add the cards to the next player's deck of cards
 
 
+_INTERNED = {}
+_CARD_TABLE = []
+
+
+def intern_card(kind, number, colour):
+    """
+    Return the shared instance of a card, creating it on first use.
+    :param kind (type): The Card class or subclass of the card
+    :param number (int): The number of the card
+    :param colour (str): The colour of the card
+    :return (Card): The one immutable card with the given kind, number and colour
+    """
+    key = (kind, number, colour)
+    card = _INTERNED.get(key)
+    if card is None:
+        card = kind(number, colour)
+        card._index = len(_CARD_TABLE)
+        _CARD_TABLE.append(card)
+        _INTERNED[key] = card
+    return card
+
+
+MATCH_KINDS = (Card, SkipCard, ReverseCard, Pickup2Card, Pickup4Card)
+
+_match_table_size = 0
+
+
+def build_match_table():
+    """
+    Precompute whether each interned card can be placed on every other interned card.
+    Only cards of the built in kinds are precomputed, other cards use their matches method.
+    """
+    global _match_table_size
+    if _match_table_size == len(_CARD_TABLE):
+        return
+
+    for card in _CARD_TABLE:
+        if card.__class__ in MATCH_KINDS:
+            card._matches = bytearray(card.matches(other) for other in _CARD_TABLE)
+    _match_table_size = len(_CARD_TABLE)
+
+
+def matches(card, other):
+    """
+    Determine if a card can be placed on another card using the precomputed match table.
+    :param card: The card to be placed, an instance of the Card class
+    :param other: The card to place it on, an instance of the Card class
+    :return (bool): The same result as card.matches(other)
+    """
+    try:
+        return card._matches[other._index] == 1
+    except (AttributeError, TypeError, IndexError):
+        # not interned, a custom card or interned after the table was built
+        return card.matches(other)
+
+
 class Deck:
     """
     A collection of ordered Uno cards
@@ -225,12 +338,21 @@ class Deck:
         if starting_cards is None:
             starting_cards = []
         self._starting_cards = starting_cards
+        self._random = random
+        # whether the list of cards is shared with a copy of this deck
+        self._shared = False
+        # bumped by every change to the deck made through its methods
+        self._version = 0
+        self._listener = None
 
     def get_cards(self):
         """
-        Return the deck of cards.
+        Return the deck of cards. The list is the deck itself and must not be
+        modified, change the deck through its methods so its version is bumped.
         :return (list<Card>): The deck of cards
         """
+        if self._shared:
+            self._own()
         return self._starting_cards
 
     def get_amount(self):
@@ -240,11 +362,29 @@ class Deck:
         """
         return len(self._starting_cards)
 
+    def get_version(self):
+        """
+        Return a counter which increases whenever the deck is changed through
+        its methods.
+        :return (int): The version of the deck
+        """
+        return self._version
+
     def shuffle(self):
         """
         Shuffle the order of the cards in the deck.
         """
-        random.shuffle(self._starting_cards)
+        if self._shared:
+            self._own()
+        self._random.shuffle(self._starting_cards)
+        self._version += 1
+
+    def set_random(self, rng):
+        """
+        Set the random number generator used to shuffle the deck.
+        :param rng (random.Random): The generator to use, or the random module for the global generator
+        """
+        self._random = rng
 
     def pick(self, amount=1):
         """
@@ -252,25 +392,51 @@ class Deck:
         :param amount: The amount of cards to be picked
         :return (list<Card>): The first 'amount' of cards
         """
-        result = []
-        for _ in range(amount):
-            popped_card = self._starting_cards.pop()
-            result.append(popped_card)
+        if amount > len(self._starting_cards):
+            raise IndexError("pick {} cards from a deck of {}".format(amount, len(self._starting_cards)))
+        if amount <= 0:
+            return []
+        if self._shared:
+            self._own()
+
+        # take the top cards in a single slice, top card first
+        result = self._starting_cards[:-amount - 1:-1]
+        del self._starting_cards[-amount:]
+        self._version += 1
+        self._notify()
         return result
 
+    def deal(self, players, hand_size=7):
+        """
+        Deal 'hand_size' cards from the top of the deck to each player in one pass.
+        :param players (list<Player>): The players to deal cards to, in dealing order
+        :param hand_size (int): The amount of cards to deal to each player
+        """
+        cards = self.pick(hand_size * len(players))
+        for i, player in enumerate(players):
+            player.get_deck().add_cards(cards[i * hand_size:(i + 1) * hand_size])
+
     def add_card(self, card):
         """
         Place a card on top of the deck.
         :param card: An instance of the Card class
         """
+        if self._shared:
+            self._own()
         self._starting_cards.append(card)
+        self._version += 1
+        self._notify()
 
     def add_cards(self, cards):
         """
         Place a list of cards on top of the deck.
         :param cards: (list<Card>) A list of cards
         """
+        if self._shared:
+            self._own()
         self._starting_cards.extend(cards)
+        self._version += 1
+        self._notify()
 
     def top(self):
         """
@@ -281,18 +447,341 @@ class Deck:
             return self._starting_cards[-1]
         return None
 
+    def clear(self, keep=0):
+        """
+        Remove every card except the top 'keep' cards from the deck and return them.
+        :param keep (int): The amount of cards to leave on top of the deck
+        :return (list<Card>): The removed cards, bottom of the deck first
+        """
+        split = max(len(self._starting_cards) - keep, 0)
+        removed = self._starting_cards[:split]
+        if self._shared:
+            self._starting_cards = self._starting_cards[split:]
+            self._shared = False
+        else:
+            del self._starting_cards[:split]
+        self._version += 1
+        self._notify()
+        return removed
+
+    def remove(self, card):
+        """
+        Remove the earliest added copy of a card from the deck.
+        :param card: An instance of the Card class in the deck
+        """
+        if card not in self._starting_cards:
+            raise ValueError("{} is not in the deck".format(card))
+        if self._shared:
+            self._own()
+        self._starting_cards.remove(card)
+        self._version += 1
+        self._notify()
+
+    def set_listener(self, listener):
+        """
+        Set a callback to be notified whenever a card enters or leaves the deck.
+        :param listener (callable): Called with the deck and its new amount of cards, or None to stop notifying
+        """
+        self._listener = listener
+
+    def _notify(self):
+        """
+        Notify the listener of the amount of cards in the deck.
+        """
+        if self._listener is not None:
+            self._listener(self, self.get_amount())
+
+    def copy(self):
+        """
+        Return a copy of the deck which shares its cards until either deck is changed.
+        :return (Deck): A deck with the same cards in the same order
+        """
+        copy = Deck(self._starting_cards)
+        copy.set_random(self._random)
+        copy._shared = self._shared = True
+        return copy
+
+    def _own(self):
+        """
+        Copy the shared list of cards so the deck can be changed without affecting its copies.
+        """
+        self._starting_cards = list(self._starting_cards)
+        self._shared = False
+
+
+COLOUR_KINDS = (SkipCard, ReverseCard, Pickup2Card)
+WILD_KINDS = (Pickup4Card, )
+
+WILD_BUCKET = ("wild", )
+OTHER_BUCKET = ("other", )
+
+_COLOUR_KEYS = {}
+_INDEX_KEYS = {}
+_MATCH_KEYS = {}
+
+
+def _colour_key(colour):
+    """
+    Return a small integer standing in for a colour, so buckets hash quickly.
+    :param colour (str): The colour of a card
+    :return (int): The key of the colour
+    """
+    return _COLOUR_KEYS.setdefault(colour, len(_COLOUR_KEYS))
+
+
+def _index_keys(card):
+    """
+    Return the keys of the hand buckets a card is stored in.
+    :param card: An instance of the Card class
+    :return (tuple): The bucket keys for the card
+    """
+    keys = _INDEX_KEYS.get(card)
+    if keys is not None:
+        return keys
+
+    kind = card.__class__
+    if kind is Card:
+        keys = (("colour", _colour_key(card.get_colour())),
+                ("number", card.get_number()))
+    elif kind in COLOUR_KINDS:
+        keys = (("colour", _colour_key(card.get_colour())), )
+    elif kind in WILD_KINDS:
+        keys = (WILD_BUCKET, )
+    else:
+        keys = (OTHER_BUCKET, )
+
+    # only interned cards are guaranteed to keep their colour and number
+    if card._index is not None:
+        _INDEX_KEYS[card] = keys
+    return keys
+
+
+def _match_keys(card):
+    """
+    Return the keys of the hand buckets holding cards which can be placed on a card.
+    :param card: The card to match against
+    :return (tuple): The bucket keys of matching cards
+    """
+    keys = _MATCH_KEYS.get(card)
+    if keys is not None:
+        return keys
+
+    keys = (("colour", _colour_key(card.get_colour())),
+            ("number", card.get_number()),
+            WILD_BUCKET)
+    if card._index is not None:
+        _MATCH_KEYS[card] = keys
+    return keys
+
+
+class Hand(Deck):
+    """
+    A player's deck of cards, indexed by colour and number so that a card
+    matching the top of a pile can be found and removed in constant time.
+
+    Number cards are bucketed by colour and by number, other coloured cards
+    by colour only and Pickup4 cards in a wildcard bucket. Cards of custom
+    kinds are kept in a bucket which is searched with matches.
+
+    get_cards returns a list view of the hand in the order the cards were
+    added, use remove and pop rather than modifying the view.
+    """
+    def __init__(self, starting_cards=None):
+        """
+        Construct a hand of cards.
+        :param starting_cards (list<Card>): The starting hand of cards
+        """
+        super().__init__()
+        self._cards = {}
+        self._positions = {}
+        self._buckets = {}
+        self._next = 0
+        self._view = []
+        if starting_cards is not None:
+            self.add_cards(starting_cards)
+
+    def _insert(self, card):
+        """
+        Add a card to the end of the hand and its buckets.
+        :param card: An instance of the Card class
+        """
+        sequence = self._next
+        self._next += 1
+        self._cards[sequence] = card
+        positions = self._positions.get(card)
+        if positions is None:
+            positions = self._positions[card] = {}
+        positions[sequence] = None
+        for key in _index_keys(card):
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = {}
+            bucket[sequence] = card
+        self._view = None
+        self._version += 1
+        self._notify()
+
+    def _delete(self, sequence):
+        """
+        Remove the card added at the given sequence number from the hand and its buckets.
+        :param sequence (int): The sequence number of the card
+        :return (Card): The removed card
+        """
+        card = self._cards.pop(sequence)
+        positions = self._positions[card]
+        del positions[sequence]
+        if not positions:
+            del self._positions[card]
+        for key in _index_keys(card):
+            del self._buckets[key][sequence]
+        self._view = None
+        self._version += 1
+        self._notify()
+        return card
+
+    def get_cards(self):
+        """
+        Return a list view of the hand of cards. The view is shared until the
+        hand next changes and must not be modified.
+        :return (list<Card>): The hand of cards
+        """
+        if self._view is None:
+            self._view = list(self._cards.values())
+        return self._view
+
+    def get_amount(self):
+        """
+        Return the amount of cards in the hand.
+        :return (int): The amount of cards in the hand
+        """
+        return len(self._cards)
+
+    def shuffle(self):
+        """
+        Shuffle the order of the cards in the hand.
+        """
+        cards = list(self._cards.values())
+        self._random.shuffle(cards)
+        self._cards.clear()
+        self._positions.clear()
+        self._buckets.clear()
+        self.add_cards(cards)
+
+    def pick(self, amount=1):
+        """
+        Take the last 'amount' of cards added to the hand and return them.
+        :param amount: The amount of cards to be picked
+        :return (list<Card>): The last 'amount' of cards, most recent first
+        """
+        result = []
+        for _ in range(amount):
+            result.append(self._delete(next(reversed(self._cards))))
+        return result
+
+    def add_card(self, card):
+        """
+        Add a card to the hand.
+        :param card: An instance of the Card class
+        """
+        self._insert(card)
+
+    def add_cards(self, cards):
+        """
+        Add a list of cards to the hand.
+        :param cards: (list<Card>) A list of cards
+        """
+        for card in cards:
+            self._insert(card)
+
+    def top(self):
+        """
+        Return the last card added to the hand or None if the hand is empty.
+        :return: The last card added to the hand or None if the hand is empty
+        """
+        if self._cards:
+            return self._cards[next(reversed(self._cards))]
+        return None
+
+    def clear(self, keep=0):
+        """
+        Remove every card except the last 'keep' cards added to the hand and return them.
+        :param keep (int): The amount of cards to leave in the hand
+        :return (list<Card>): The removed cards, earliest added first
+        """
+        split = max(len(self._cards) - keep, 0)
+        return [self._delete(sequence) for sequence in list(self._cards)[:split]]
+
+    def copy(self):
+        """
+        Return a copy of the hand.
+        :return (Hand): A hand with the same cards in the same order
+        """
+        copy = Hand(self.get_cards())
+        copy.set_random(self._random)
+        return copy
+
+    def remove(self, card):
+        """
+        Remove the earliest added copy of a card from the hand.
+        :param card: An instance of the Card class in the hand
+        """
+        positions = self._positions.get(card)
+        if not positions:
+            raise ValueError("{} is not in the hand".format(card))
+        self._delete(next(iter(positions)))
+
+    def pop(self, index=-1):
+        """
+        Remove and return the card at a position in the list view of the hand.
+        :param index (int): The position of the card in get_cards
+        :return (Card): The removed card
+        """
+        return self._delete(list(self._cards)[index])
+
+    def find_match(self, card):
+        """
+        Return the earliest added card in the hand which can be placed on a given card.
+        :param card: The card to match against, usually the top of the putdown pile
+        :return: The first matching card in the hand, or None if no card matches
+        """
+        buckets = self._buckets
+        first = None
+        for key in _match_keys(card):
+            bucket = buckets.get(key)
+            if bucket:
+                sequence = next(iter(bucket))
+                if first is None or sequence < first:
+                    first = sequence
+
+        other = buckets.get(OTHER_BUCKET)
+        if other:
+            for sequence, other_card in other.items():
+                if first is not None and sequence > first:
+                    break
+                if matches(other_card, card):
+                    first = sequence
+                    break
+
+        if first is None:
+            return None
+        return self._cards[first]
+
 
 class Player:
     """
     A representation of one of the players in a game of uno
+
+    Subclasses may set deck_class to hold their cards in another kind of deck.
     """
+    deck_class = Hand
+
     def __init__(self, name):
         """
         Construct a player in a game.
         :param name (str): The name of the player
         """
         self._name = name
-        self._deck = Deck()
+        self._deck = self.deck_class()
 
     def get_name(self):
         """
@@ -308,6 +797,22 @@ class Player:
         """
         return self._deck
 
+    def join(self, game):
+        """
+        Called when the player is seated in a game, before any turns are taken.
+        :param game: The instance of the UnoGame class the player is seated in
+        """
+        pass
+
+    def clone(self):
+        """
+        Return a new player with the same name and settings, holding no cards.
+        Subclasses constructed with more than a name override this to pass on
+        their settings.
+        :return (Player): The new player
+        """
+        return self.__class__(self._name)
+
     def is_playable(self):
         """
         Raise a NotImplementedError on the base Player class.
@@ -319,7 +824,7 @@ class Player:
         Return True if the player has an empty deck and therefore won.
         :return: True the player has won
         """
-        if not self._deck.get_cards():
+        if self._deck.get_amount() == 0:
             return True
         return False
 
@@ -362,10 +867,16 @@ class ComputerPlayer(Player):
         :param putdown_pile: An instance of the Deck class
         :return: The matching card if it can be found.
         """
-        for card in self.get_deck().get_cards():
-            if card.matches(putdown_pile.top()):
-                self.get_deck().get_cards().remove(card)
-                return card
+        hand = self.get_deck()
+        top = putdown_pile.top()
+        if isinstance(hand, Hand):
+            card = hand.find_match(top)
+        else:
+            card = next((card for card in hand.get_cards() if matches(card, top)), None)
+
+        if card is not None:
+            hand.remove(card)
+        return card
 
 
 def main():
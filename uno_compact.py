@@ -0,0 +1,252 @@
+"""
+A compact encoding of Uno cards as single bytes.
+
+Plain number cards are encoded as 0b0CCCNNNN where CCC is the index of the
+card colour and NNNN is the card number plus one, allowing numbers from -1 up
+to 14. Action cards are encoded as 0b1KKKKCCC where KKKK is the index of the
+card kind, their number is always -1 as in decks from uno_util.build_deck.
+"""
+from array import array
+
+from uno import Card, SkipCard, ReverseCard, Pickup2Card, Pickup4Card
+from uno import Deck, intern_card
+from uno_util import CardColour
+
+CARD_KINDS = (Card, SkipCard, ReverseCard, Pickup2Card, Pickup4Card)
+CARD_COLOURS = tuple(CardColour)
+
+_KIND_INDEX = {kind: index for index, kind in enumerate(CARD_KINDS)}
+_COLOUR_INDEX = {colour: index for index, colour in enumerate(CARD_COLOURS)}
+
+ACTION_FLAG = 0x80
+MIN_NUMBER = -1
+MAX_NUMBER = 14
+
+
+def encode(card):
+    """
+    Encode a card as a single byte.
+
+    Parameters:
+        card (Card): The card to encode.
+
+    Returns:
+        (int): The encoded card, between 0 and 255.
+
+    Raises:
+        ValueError: If the card can not be represented in a byte.
+    """
+    kind = _KIND_INDEX.get(card.__class__)
+    colour = _COLOUR_INDEX.get(card.get_colour())
+    number = card.get_number()
+
+    if kind is None:
+        raise ValueError("Can not encode card of type {}".format(card.__class__.__name__))
+    if colour is None:
+        raise ValueError("Can not encode card colour {}".format(card.get_colour()))
+
+    if kind == 0:
+        if not MIN_NUMBER <= number <= MAX_NUMBER:
+            raise ValueError("Can not encode card number {}".format(number))
+        return (colour << 4) | (number - MIN_NUMBER)
+
+    if number != -1:
+        raise ValueError("Can not encode {} with number {}".format(card, number))
+    return ACTION_FLAG | (kind << 3) | colour
+
+
+def decode(code):
+    """
+    Decode a byte produced by encode back into a card.
+
+    Parameters:
+        code (int): The encoded card.
+
+    Returns:
+        (Card): The interned card with the encoded kind, number and colour.
+    """
+    if code & ACTION_FLAG:
+        kind = CARD_KINDS[(code >> 3) & 0x0F]
+        return intern_card(kind, -1, CARD_COLOURS[code & 0x07])
+    return intern_card(Card, (code & 0x0F) + MIN_NUMBER, CARD_COLOURS[code >> 4])
+
+
+def encode_cards(cards):
+    """
+    Encode a list of cards.
+
+    Parameters:
+        cards (list<Card>): The cards to encode.
+
+    Returns:
+        (bytearray): The encoded cards, in the same order.
+    """
+    return bytearray(encode(card) for card in cards)
+
+
+def decode_cards(codes):
+    """
+    Decode a sequence of encoded cards.
+
+    Parameters:
+        codes (bytes|bytearray|array): The encoded cards.
+
+    Returns:
+        (list<Card>): The decoded cards, in the same order.
+    """
+    return [decode(code) for code in codes]
+
+
+class CompactDeck(Deck):
+    """
+    A deck of cards stored as an array of encoded bytes.
+
+    Cards are encoded as they are added and decoded as they are picked, so a
+    compact deck can stand in for the pickup, putdown and special piles of a
+    game. get_cards returns a decoded copy of the deck, modifying it does not
+    change the deck.
+    """
+    def __init__(self, starting_cards=None):
+        """
+        Construct a compact deck of cards.
+        :param starting_cards (list<Card>): The starting deck of cards
+        """
+        super().__init__()
+        self._codes = array('B')
+        if starting_cards is not None:
+            self.add_cards(starting_cards)
+
+    @classmethod
+    def from_deck(cls, deck):
+        """
+        Construct a compact deck with the cards of another deck.
+        :param deck: An instance of the Deck class
+        :return (CompactDeck): A compact deck with the same cards in the same order
+        """
+        return cls(deck.get_cards())
+
+    @classmethod
+    def from_codes(cls, codes):
+        """
+        Construct a compact deck from already encoded cards.
+        :param codes (bytes|bytearray|array): The encoded cards
+        :return (CompactDeck): A compact deck of the encoded cards
+        """
+        deck = cls()
+        deck._codes.frombytes(bytes(codes))
+        return deck
+
+    def copy(self):
+        """
+        Return a copy of the deck.
+        :return (CompactDeck): A compact deck with the same cards in the same order
+        """
+        copy = CompactDeck.from_codes(self._codes)
+        copy.set_random(self._random)
+        return copy
+
+    def to_deck(self):
+        """
+        Return a regular deck with the cards of this deck.
+        :return (Deck): A deck of Card instances in the same order
+        """
+        return Deck(self.get_cards())
+
+    def get_codes(self):
+        """
+        Return the encoded cards in the deck.
+        :return (array): The encoded cards, the last being the top of the deck
+        """
+        return self._codes
+
+    def get_cards(self):
+        """
+        Return a decoded copy of the deck of cards.
+        :return (list<Card>): The deck of cards
+        """
+        return decode_cards(self._codes)
+
+    def get_amount(self):
+        """
+        Return the amount of cards in the deck.
+        :return (int): The amount of cards in the deck
+        """
+        return len(self._codes)
+
+    def shuffle(self):
+        """
+        Shuffle the order of the cards in the deck.
+        """
+        codes = self._codes.tolist()
+        self._random.shuffle(codes)
+        self._codes = array('B', codes)
+        self._version += 1
+
+    def pick(self, amount=1):
+        """
+        Take the first 'amount' of cards off the deck and return them.
+        :param amount: The amount of cards to be picked
+        :return (list<Card>): The first 'amount' of cards
+        """
+        if amount > len(self._codes):
+            raise IndexError("pick {} cards from a deck of {}".format(amount, len(self._codes)))
+        if amount <= 0:
+            return []
+
+        result = decode_cards(self._codes[:-amount - 1:-1])
+        del self._codes[-amount:]
+        self._version += 1
+        self._notify()
+        return result
+
+    def add_card(self, card):
+        """
+        Place a card on top of the deck.
+        :param card: An instance of the Card class
+        """
+        self._codes.append(encode(card))
+        self._version += 1
+        self._notify()
+
+    def add_cards(self, cards):
+        """
+        Place a list of cards on top of the deck.
+        :param cards: (list<Card>) A list of cards
+        """
+        self._codes.extend(encode(card) for card in cards)
+        self._version += 1
+        self._notify()
+
+    def remove(self, card):
+        """
+        Remove the earliest added copy of a card from the deck.
+        :param card: An instance of the Card class in the deck
+        """
+        code = encode(card)
+        if code not in self._codes:
+            raise ValueError("{} is not in the deck".format(card))
+        self._codes.remove(code)
+        self._version += 1
+        self._notify()
+
+    def top(self):
+        """
+        Peaks at the card on top of the deck and returns it or None if the deck is empty.
+        :return: The card on top of the deck or None if the deck is empty
+        """
+        if self._codes:
+            return decode(self._codes[-1])
+        return None
+
+    def clear(self, keep=0):
+        """
+        Remove every card except the top 'keep' cards from the deck and return them.
+        :param keep (int): The amount of cards to leave on top of the deck
+        :return (list<Card>): The removed cards, bottom of the deck first
+        """
+        split = max(len(self._codes) - keep, 0)
+        removed = decode_cards(self._codes[:split])
+        del self._codes[:split]
+        self._version += 1
+        self._notify()
+        return removed
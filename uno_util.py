@@ -1,8 +1,9 @@
 import random
 from enum import Enum
+from functools import partial
 
 from uno import Card, SkipCard, ReverseCard, Pickup2Card, Pickup4Card
-from uno import Deck
+from uno import Deck, intern_card, build_match_table, matches
 
 
 class CardColour(Enum):
@@ -111,30 +112,135 @@ class TurnManager:
         self._location %= self._max
         return self._players[self._location]
 
+    def get_state(self):
+        """
+        (tuple<int, bool>) Returns the location and direction of play.
+        """
+        return self._location, self._direction
+
+    def set_state(self, state):
+        """
+        Move to a location and direction of play from get_state.
+
+        Parameters:
+            state (tuple<int, bool>): The location and direction of play.
+        """
+        self._location, self._direction = state
+
+
+class GameSnapshot:
+    """
+    The state of a game of Uno at one point in time.
+
+    Cards are immutable once interned, so a snapshot only stores the order
+    of the cards in each hand and pile rather than copies of the cards.
+    """
+    def __init__(self, hands, pickup_pile, putdown_pile, special_pile, turns,
+                 winner, random_state=None):
+        """
+        Construct a snapshot of a game.
+
+        Parameters:
+            hands (tuple<tuple<Card>>): The cards in each player's hand.
+            pickup_pile (tuple<Card>): The cards in the pickup pile.
+            putdown_pile (tuple<Card>): The cards in the putdown pile.
+            special_pile (tuple<Card>): The cards in the special pile.
+            turns (tuple<int, bool>): The state of the turn manager.
+            winner (int): The index of the winning player, or None.
+            random_state (tuple): The state of the game's random number
+                                  generator, or None if it is the global one.
+        """
+        self.hands = hands
+        self.pickup_pile = pickup_pile
+        self.putdown_pile = putdown_pile
+        self.special_pile = special_pile
+        self.turns = turns
+        self.winner = winner
+        self.random_state = random_state
+
 
 class UnoGame:
     """
     A game of Uno++.
     """
-    def __init__(self, deck, players):
+    def __init__(self, deck, players, recycle=False, rng=None):
         """
         Construct a game of uno from a pickup pile and list of players.
 
         Parameters:
             deck (Deck): The pile of cards to pickup from.
             players (list<Player>): The players in this game of uno.
+            recycle (bool): Whether the putdown and special piles are shuffled
+                            back into the pickup pile when it runs out.
+            rng (random.Random|int): The random number generator, or a seed
+                                     for one, used to shuffle the piles. If
+                                     None, the global generator is used.
         """
         self.pickup_pile = deck
-        self.players = players
+        self._recycle = recycle
 
+        self._random = make_random(rng)
+        if rng is not None:
+            self.pickup_pile.set_random(self._random)
+
+        self._seat(players, Deck(self.pickup_pile.pick()), Deck())
+
+    def _seat(self, players, putdown_pile, special_pile):
+        """
+        Seat the players of the game and lay out the putdown and special piles.
+
+        Parameters:
+            players (list<Player>): The players in this game of uno.
+            putdown_pile (Deck): The pile of cards played on.
+            special_pile (Deck): The pile of played special cards.
+        """
+        self.players = players
         self._turns = TurnManager(players)
 
-        self.putdown_pile = Deck(self.pickup_pile.pick())
-        self.special_pile = Deck()
+        self.putdown_pile = putdown_pile
+        self.special_pile = special_pile
 
         self._is_over = False
         self.winner = None
 
+        # track the size of every hand so the winner is known as soon as a
+        # player places their last card, hands may still be empty if cards
+        # are dealt after the game is built
+        self._hand_sizes = {}
+        for player in players:
+            deck = player.get_deck()
+            deck.set_listener(partial(self._update_hand_size, player))
+            self._hand_sizes[player] = deck.get_amount()
+            player.join(self)
+
+    def _update_hand_size(self, player, deck, amount):
+        """
+        Record the new size of a player's hand, ending the game if it is empty
+        and carrying on with the game if the winner's hand is filled again.
+
+        Parameters:
+            player (Player): The player whose hand changed.
+            deck (Deck): The player's hand.
+            amount (int): The amount of cards now in the hand.
+        """
+        self._hand_sizes[player] = amount
+        if amount == 0:
+            if not self._is_over:
+                self.winner = player
+                self._is_over = True
+        elif player is self.winner:
+            self.winner = None
+            self._is_over = False
+
+    def get_hand_size(self, player):
+        """
+        (int) Returns the amount of cards in a player's hand.
+
+        Parameters:
+            player (Player): A player in this game.
+        """
+        return self._hand_sizes[player]
+
     def next_player(self):
         """
         Changes to the next player in the game and returns an instance of them.
@@ -162,17 +268,141 @@ class UnoGame:
         """(TurnManager) Returns the turn manager for this game."""
         return self._turns
 
-    def is_over(self):
+    def get_random(self):
+        """(random.Random) Returns the random number generator for this game."""
+        return self._random
+
+    def snapshot(self):
         """
-        (bool): True iff the game has been won. Assigns the winner variable.
+        (GameSnapshot) Returns the current state of the game, for restore.
         """
-        for player in self.players:
-            if player.has_won():
-                self.winner = player
-                self._is_over = True
+        random_state = None
+        if isinstance(self._random, random.Random):
+            random_state = self._random.getstate()
+
+        winner = None if self.winner is None else self.players.index(self.winner)
+        return GameSnapshot(
+            tuple(tuple(player.get_deck().get_cards()) for player in self.players),
+            tuple(self.pickup_pile.get_cards()),
+            tuple(self.putdown_pile.get_cards()),
+            tuple(self.special_pile.get_cards()),
+            self._turns.get_state(),
+            winner,
+            random_state
+        )
+
+    def restore(self, snapshot):
+        """
+        Return the game to the state it was in when a snapshot was taken.
+
+        Parameters:
+            snapshot (GameSnapshot): A snapshot taken of this game.
+        """
+        for player, cards in zip(self.players, snapshot.hands):
+            hand = player.get_deck()
+            hand.clear()
+            hand.add_cards(cards)
+
+        for pile, cards in ((self.pickup_pile, snapshot.pickup_pile),
+                            (self.putdown_pile, snapshot.putdown_pile),
+                            (self.special_pile, snapshot.special_pile)):
+            pile.clear()
+            pile.add_cards(cards)
+
+        self._turns.set_state(snapshot.turns)
+
+        if snapshot.random_state is not None:
+            self._random.setstate(snapshot.random_state)
+
+        # emptying the hands above may have ended the game
+        self._is_over = snapshot.winner is not None
+        self.winner = None if snapshot.winner is None else self.players[snapshot.winner]
+
+    def clone(self, players=None, rng=None):
+        """
+        Construct an independent copy of the game.
 
+        Hands are copied, while the piles are shared with this game until
+        either game changes them.
+
+        Parameters:
+            players (list<Player>): The players to seat in the copy, whose
+                                    hands are replaced with copies of this
+                                    game's hands. If None, each player is
+                                    cloned with Player.clone.
+            rng (random.Random|int): The random number generator of the copy,
+                                     or a seed for one. If None, a copy of
+                                     this game's generator is used.
+
+        Returns:
+            (UnoGame): The copy of the game.
+        """
+        if players is None:
+            players = [player.clone() for player in self.players]
+
+        for player, original in zip(players, self.players):
+            hand = player.get_deck()
+            hand.clear()
+            hand.add_cards(original.get_deck().get_cards())
+
+        if rng is not None:
+            rng = make_random(rng)
+        elif isinstance(self._random, random.Random):
+            rng = random.Random()
+            rng.setstate(self._random.getstate())
+        else:
+            rng = self._random
+
+        game = UnoGame.__new__(UnoGame)
+        game.pickup_pile = self.pickup_pile.copy()
+        game.pickup_pile.set_random(rng)
+        game._recycle = self._recycle
+        game._random = rng
+        game._seat(players, self.putdown_pile.copy(), self.special_pile.copy())
+
+        game._turns.set_state(self._turns.get_state())
+        if self.winner is not None:
+            game.winner = players[self.players.index(self.winner)]
+            game._is_over = True
+        return game
+
+    def is_over(self):
+        """
+        (bool): True iff the game has been won. The winner variable is
+                assigned when the winning card leaves the player's hand.
+        """
         return self._is_over
 
+    def recycle(self):
+        """
+        Shuffle the putdown pile, except its top card, and the special pile
+        back into the pickup pile underneath the cards left in it.
+        """
+        remaining = self.pickup_pile.clear()
+        self.pickup_pile.add_cards(self.putdown_pile.clear(keep=1))
+        self.pickup_pile.add_cards(self.special_pile.clear())
+        self.pickup_pile.shuffle()
+        self.pickup_pile.add_cards(remaining)
+
+    def draw_cards(self, amount=1):
+        """
+        Take cards from the top of the pickup pile.
+
+        If recycling is enabled and the pickup pile has too few cards, the
+        discarded cards are recycled first and as many cards as are available
+        are taken.
+
+        Parameters:
+            amount (int): The amount of cards to take.
+
+        Returns:
+            (list<Card>): The cards taken from the pickup pile.
+        """
+        if self._recycle and self.pickup_pile.get_amount() < amount:
+            self.recycle()
+            amount = min(amount, self.pickup_pile.get_amount())
+        return self.pickup_pile.pick(amount)
+
     def select_card(self, player, card):
         """Perform actions for a player selecting a card
 
@@ -193,13 +423,22 @@ class UnoGame:
         Parameters:
             player (Player): The player whose turn it is.
         """
-        card = player.pick_card(self.putdown_pile)
+        self.play_card(player, player.pick_card(self.putdown_pile))
 
+    def play_card(self, player, card):
+        """
+        Finishes the turn of a player who has picked a card from their hand.
+
+        Parameters:
+            player (Player): The player whose turn it is.
+            card (Card): The card picked by the player, or None if they have
+                         no matching card and pick up a card instead.
+        """
         if card is None:
-            player.get_deck().add_cards(self.pickup_pile.pick())
+            player.get_deck().add_cards(self.draw_cards())
             return
 
-        if card.matches(self.putdown_pile.top()):
+        if matches(card, self.putdown_pile.top()):
             self.select_card(player, card)
 
     def take_turns(self):
@@ -209,7 +448,7 @@ class UnoGame:
         for player in self.players:
             self.take_turn(player)
 
-            if player.has_won():
+            if self._is_over:
                 return
 
 
@@ -225,6 +464,10 @@ def build_deck(structure, range_cards=(Card, )):
     skip cards with the numbers 3 and 4. Assuming both cards are in range_cards,
     otherwise creates the same amount of cards with -1 as their numbers.
 
+    The cards in the deck are interned, so every deck shares the same
+    immutable instance of each distinct card, and the match table for the
+    cards is built so uno.matches is a single lookup.
+
     Parameters:
         structure (list<tuple>): The simplified deck structure.
         range_cards (tuple<Card>): Cards whose numbers should be updated from -1.
@@ -232,22 +475,74 @@ def build_deck(structure, range_cards=(Card, )):
     deck = []
 
     for (card, (start, end)) in structure:
+        kind = card.__class__
+        colour = card.get_colour()
         for number in range(start, end):
-            new_card = card.__class__(-1, card.get_colour())
-            if card.__class__ in range_cards:
-                new_card.set_number(number)
-            deck.append(new_card)
+            if kind not in range_cards:
+                number = -1
+            deck.append(intern_card(kind, number, colour))
 
+    build_match_table()
     return deck
 
 
-def generate_name():
+def make_random(rng=None):
+    """
+    Construct a random number generator from a generator or a seed.
+
+    Parameters:
+        rng (random.Random|int): A generator to use as is, or a seed for a new
+                                 generator. If None, the global generator.
+
+    Returns:
+        (random.Random): The random number generator.
+    """
+    if rng is None:
+        return random
+    if isinstance(rng, int):
+        return random.Random(rng)
+    return rng
+
+
+def derive_seed(master_seed, index):
+    """
+    Derive the seed of one game in a batch from the seed of the batch.
+
+    The derived seeds are independent of each other and are the same in every
+    process, so a single game can be replayed from its seed alone.
+
+    Parameters:
+        master_seed (int): The seed of the batch.
+        index (int): The position of the game in the batch.
+
+    Returns:
+        (int): The seed of the game.
+    """
+    return random.Random("{}/{}".format(master_seed, index)).getrandbits(64)
+
+
+def derive_seeds(master_seed, count):
+    """
+    (list<int>): Derives the seeds of the first 'count' games in a batch.
+
+    Parameters:
+        master_seed (int): The seed of the batch.
+        count (int): The amount of seeds to derive.
+    """
+    return [derive_seed(master_seed, index) for index in range(count)]
+
+
+def generate_name(rng=None):
     """
     (str): Selects a random name from a list of player names.
+
+    Parameters:
+        rng (random.Random): The generator to choose with, the global
+                             generator if None.
     """
     with open("players.txt", "r") as file:
         names = file.readlines()
-    return random.choice(names).strip()
+    return make_random(rng).choice(names).strip()
 
 
 def main():
@@ -0,0 +1,361 @@
+"""
+Lockstep simulation of many games of Uno at once with NumPy.
+
+Every game is stored as rows of arrays (hand counts over the distinct kinds of
+card, the pickup pile, the top of the putdown pile, the current seat and the
+direction of play) and all games advance one turn per step using array
+operations. Players follow the same first-match policy as
+uno.ComputerPlayer.pick_card and games recycle their discarded cards like
+UnoGame with recycling enabled.
+
+Run a batch from the command line with:
+
+    python -m vectorized --games 100000 --players 4
+"""
+import argparse
+import time
+
+import numpy as np
+
+from uno import SkipCard, ReverseCard, matches
+from uno_util import FULL_DECK, SPECIAL_CARDS, build_deck
+
+HAND_SIZE = 7
+MAX_TURNS = 10000
+BATCH_SIZE = 4096
+
+NEVER = np.iinfo(np.int32).max
+
+
+class CardKinds:
+    """
+    The distinct cards of a deck structure and their precomputed behaviour.
+    """
+    def __init__(self, structure=FULL_DECK):
+        """
+        Construct the card kinds of a deck.
+
+        Parameters:
+            structure (list<tuple>): The simplified deck structure, as used by
+                                     uno_util.build_deck.
+        """
+        self.deck = build_deck(structure)
+
+        self.cards = []
+        self._index = {}
+        for card in self.deck:
+            if card not in self._index:
+                self._index[card] = len(self.cards)
+                self.cards.append(card)
+
+        # the kind of every card in the deck, in deck order
+        self.deck_kinds = np.array([self._index[card] for card in self.deck], dtype=np.int16)
+        self.copies = int(np.bincount(self.deck_kinds).max())
+
+        # match[hand, top] is True iff a hand card of kind 'hand' can be placed on 'top'
+        self.match = np.array([[matches(card, top) for top in self.cards] for card in self.cards],
+                              dtype=bool)
+
+        self.pickup = np.array([card.get_pickup_amount() for card in self.cards], dtype=np.int8)
+        self.skip = np.array([card.__class__ is SkipCard for card in self.cards])
+        self.reverse = np.array([card.__class__ is ReverseCard for card in self.cards])
+        self.special = np.array([card.__class__ in SPECIAL_CARDS for card in self.cards])
+
+    def __len__(self):
+        """
+        Return the amount of distinct kinds of card.
+        """
+        return len(self.cards)
+
+    def index(self, card):
+        """
+        (int) Returns the kind of an interned card.
+
+        Parameters:
+            card (Card): A card from the deck structure.
+        """
+        return self._index[card]
+
+
+class LockstepSimulator:
+    """
+    A batch of games of Uno between first-match computer players, advanced
+    one turn at a time in lockstep.
+    """
+    def __init__(self, decks, player_count, kinds, hand_size=HAND_SIZE,
+                 max_turns=MAX_TURNS, rng=None):
+        """
+        Construct a batch of games from the starting order of their pickup piles.
+
+        Parameters:
+            decks (np.ndarray): The kind of every card in each game's pickup
+                                pile, shape (games, cards), the last card in
+                                each row being the top of the pile.
+            player_count (int): The amount of players in each game.
+            kinds (CardKinds): The kinds of card in the decks.
+            hand_size (int): The amount of cards dealt to each player.
+            max_turns (int): The amount of turns after which a game is abandoned.
+            rng (np.random.Generator): The generator used to recycle piles.
+        """
+        games, size = decks.shape
+
+        self.kinds = kinds
+        self.player_count = player_count
+        self.max_turns = max_turns
+        self._rng = np.random.default_rng() if rng is None else rng
+        self._kind_range = np.arange(len(kinds), dtype=np.int16)
+
+        self.pile = decks.astype(np.int16)
+        self.pile_size = np.full(games, size, dtype=np.int32)
+        self.discard = np.zeros((games, len(kinds)), dtype=np.int16)
+        self.discard_sizes = np.zeros(games, dtype=np.int32)
+
+        self.hands = np.zeros((games, player_count, len(kinds)), dtype=np.int16)
+        self.hand_sizes = np.zeros((games, player_count), dtype=np.int16)
+        # the order each held copy of a card was picked up in, NEVER for empty
+        # slots, so the first matching card in a hand can be found
+        self.stamps = np.full((games, player_count, len(kinds), kinds.copies), NEVER, dtype=np.int32)
+        self.oldest = np.full((games, player_count, len(kinds)), NEVER, dtype=np.int32)
+        self._clock = 0
+
+        self.seat = np.zeros(games, dtype=np.int32)
+        self.direction = np.ones(games, dtype=np.int32)
+        self.turns = np.zeros(games, dtype=np.int32)
+        self.winner = np.full(games, -1, dtype=np.int32)
+        self.active = np.ones(games, dtype=bool)
+        self.recycles = np.zeros(games, dtype=np.int32)
+
+        # deal each player their hand, then turn over the first card
+        every_game = np.arange(games)
+        for seat in range(player_count):
+            self._draw(every_game, np.full(games, seat), hand_size)
+
+        self.pile_size -= 1
+        self.top = self.pile[every_game, self.pile_size].astype(np.int32)
+
+    @classmethod
+    def shuffled(cls, games, player_count, kinds=None, hand_size=HAND_SIZE,
+                 max_turns=MAX_TURNS, seed=None):
+        """
+        Construct a batch of games with independently shuffled decks.
+
+        Parameters:
+            games (int): The amount of games in the batch.
+            player_count (int): The amount of players in each game.
+            kinds (CardKinds): The kinds of card, a full deck if None.
+            hand_size (int): The amount of cards dealt to each player.
+            max_turns (int): The amount of turns after which a game is abandoned.
+            seed (int): The seed of the batch's random number generator.
+
+        Returns:
+            (LockstepSimulator): The batch of games, ready to be played.
+        """
+        if kinds is None:
+            kinds = CardKinds()
+        rng = np.random.default_rng(seed)
+        decks = rng.permuted(np.tile(kinds.deck_kinds, (games, 1)), axis=1)
+        return cls(decks, player_count, kinds, hand_size=hand_size,
+                   max_turns=max_turns, rng=rng)
+
+    def _recycle(self, games):
+        """
+        Shuffle the discarded cards of games with empty pickup piles back into
+        their pickup piles.
+
+        Parameters:
+            games (np.ndarray): The games whose piles should be recycled.
+        """
+        counts = self.discard[games]
+        sizes = counts.sum(axis=1)
+
+        # expand each game's discard counts into cards, then shuffle the cards
+        # of each game by sorting on a random key within the game
+        recycled = np.repeat(np.tile(self._kind_range, len(games)), counts.ravel())
+        owner = np.repeat(np.arange(len(games)), sizes)
+        recycled = recycled[np.lexsort((self._rng.random(len(recycled)), owner))]
+        positions = np.arange(len(recycled)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+
+        self.pile[games[owner], positions] = recycled
+        self.pile_size[games] = sizes
+        self.discard[games] = 0
+        self.discard_sizes[games] = 0
+        self.recycles[games] += 1
+
+    def _draw(self, games, seats, amount):
+        """
+        Move cards from the top of the pickup piles into players' hands.
+
+        Parameters:
+            games (np.ndarray): The games drawing cards, each at most once.
+            seats (np.ndarray): The seat drawing in each game.
+            amount (int): The amount of cards each player draws.
+        """
+        for _ in range(amount):
+            exhausted = (self.pile_size[games] == 0) & (self.discard_sizes[games] > 0)
+            if exhausted.any():
+                self._recycle(games[exhausted])
+
+            available = self.pile_size[games] > 0
+            drawing, drawing_seats = games[available], seats[available]
+
+            self.pile_size[drawing] -= 1
+            drawn = self.pile[drawing, self.pile_size[drawing]]
+
+            self.hands[drawing, drawing_seats, drawn] += 1
+            self.hand_sizes[drawing, drawing_seats] += 1
+            slot = (self.stamps[drawing, drawing_seats, drawn] == NEVER).argmax(axis=1)
+            self.stamps[drawing, drawing_seats, drawn, slot] = self._clock
+            oldest = self.oldest[drawing, drawing_seats, drawn]
+            self.oldest[drawing, drawing_seats, drawn] = np.minimum(oldest, self._clock)
+            self._clock += 1
+
+    def step(self):
+        """
+        Advance every unfinished game by one turn.
+
+        Returns:
+            (int): The amount of games which were advanced.
+        """
+        games = np.flatnonzero(self.active)
+        if not len(games):
+            return 0
+        advanced = len(games)
+        self.turns[games] += 1
+
+        kinds = self.kinds
+        direction = self.direction[games]
+
+        # move on to the next player
+        seats = (self.seat[games] + direction) % self.player_count
+        self.seat[games] = seats
+
+        # find the first card each player picked up which matches the top card
+        playable = kinds.match[:, self.top[games]].T
+        candidates = np.where(playable, self.oldest[games, seats], NEVER)
+        chosen = candidates.argmin(axis=1)
+        plays = candidates[np.arange(len(games)), chosen] != NEVER
+
+        # players without a matching card pick one up
+        self._draw(games[~plays], seats[~plays], 1)
+
+        games, seats, chosen, direction = games[plays], seats[plays], chosen[plays], direction[plays]
+
+        # remove the played card from each hand
+        stamps = self.stamps[games, seats, chosen]
+        stamps[np.arange(len(games)), stamps.argmin(axis=1)] = NEVER
+        self.stamps[games, seats, chosen] = stamps
+        self.oldest[games, seats, chosen] = stamps.min(axis=1)
+        self.hands[games, seats, chosen] -= 1
+        self.hand_sizes[games, seats] -= 1
+        won = self.hand_sizes[games, seats] == 0
+
+        # apply the effect of each played card
+        skipped = kinds.skip[chosen]
+        self.seat[games[skipped]] = (seats[skipped] + direction[skipped]) % self.player_count
+
+        reversed_ = kinds.reverse[chosen]
+        self.direction[games[reversed_]] *= -1
+
+        for amount in np.unique(kinds.pickup[chosen]):
+            if amount:
+                picking = kinds.pickup[chosen] == amount
+                victims = (seats[picking] + direction[picking]) % self.player_count
+                self._draw(games[picking], victims, int(amount))
+
+        # place the played cards on the putdown or special piles
+        special = kinds.special[chosen]
+        normal_games = games[~special]
+        self.discard[normal_games, self.top[normal_games]] += 1
+        self.top[normal_games] = chosen[~special]
+        self.discard[games[special], chosen[special]] += 1
+        self.discard_sizes[games] += 1
+
+        self.winner[games[won]] = seats[won]
+        self.active[games[won]] = False
+        self.active[self.turns >= self.max_turns] = False
+
+        return advanced
+
+    def run(self):
+        """
+        Play every game in the batch until it is won or abandoned.
+
+        Returns:
+            (tuple<np.ndarray, np.ndarray>): The amount of turns taken in each
+                game and the seat of each winner, -1 for abandoned games.
+        """
+        while self.step():
+            pass
+        return self.turns, self.winner
+
+
+def simulate(games, player_count, hand_size=HAND_SIZE, max_turns=MAX_TURNS,
+             batch_size=BATCH_SIZE, seed=None):
+    """
+    Simulate games in lockstep batches.
+
+    Parameters:
+        games (int): The amount of games to simulate.
+        player_count (int): The amount of players in each game.
+        hand_size (int): The amount of cards dealt to each player.
+        max_turns (int): The amount of turns after which a game is abandoned.
+        batch_size (int): The amount of games advanced together, which
+                          bounds the memory used.
+        seed (int): The seed the batch seeds are derived from.
+
+    Returns:
+        (tuple<np.ndarray, np.ndarray>): The amount of turns taken in each
+            game and the seat of each winner, -1 for abandoned games.
+    """
+    kinds = CardKinds()
+    seeds = np.random.SeedSequence(seed).spawn((games + batch_size - 1) // batch_size)
+
+    turns, winners = [], []
+    for start, batch_seed in zip(range(0, games, batch_size), seeds):
+        batch = LockstepSimulator.shuffled(min(batch_size, games - start), player_count,
+                                           kinds=kinds, hand_size=hand_size,
+                                           max_turns=max_turns, seed=batch_seed)
+        batch_turns, batch_winners = batch.run()
+        turns.append(batch_turns)
+        winners.append(batch_winners)
+
+    if not turns:
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)
+    return np.concatenate(turns), np.concatenate(winners)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate games of Uno in lockstep with NumPy.")
+    parser.add_argument("--games", type=int, default=100000,
+                        help="amount of games to simulate")
+    parser.add_argument("--players", type=int, default=4,
+                        help="amount of computer players in each game")
+    parser.add_argument("--hand-size", type=int, default=HAND_SIZE,
+                        help="amount of cards dealt to each player")
+    parser.add_argument("--max-turns", type=int, default=MAX_TURNS,
+                        help="amount of turns after which a game is abandoned")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help="amount of games advanced together")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed of the simulation")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    turns, winners = simulate(args.games, args.players, hand_size=args.hand_size,
+                              max_turns=args.max_turns, batch_size=args.batch_size,
+                              seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    print("games:       {}".format(len(turns)))
+    print("abandoned:   {}".format(int((winners < 0).sum())))
+    print("elapsed:     {:.3f}s".format(elapsed))
+    print("games/sec:   {:.1f}".format(len(turns) / elapsed))
+    print("turns/sec:   {:.1f}".format(turns.sum() / elapsed))
+    if len(turns):
+        print("turns/game:  min {} / mean {:.1f} / max {}".format(turns.min(), turns.mean(), turns.max()))
+    for seat in range(args.players):
+        print("seat {}:      {} wins".format(seat, int((winners == seat).sum())))
+
+
+if __name__ == "__main__":
+    main()